@@ -0,0 +1,94 @@
+import numpy as np
+from core.board_generator import count_neighbors
+
+
+class ConstraintEngine:
+    def build_constraints(self, visible_board):
+        rows, cols = visible_board.shape
+        hidden = visible_board == -2
+        flagged = visible_board == -3
+
+        # Only revealed numbers that still touch a hidden cell say anything new.
+        hidden_neighbors = count_neighbors(hidden)
+        flagged_neighbors = count_neighbors(flagged)
+        sources = np.argwhere((visible_board >= 0) & (hidden_neighbors > 0))
+
+        constraints = {}
+        for r, c in sources:
+            cells = frozenset(
+                nr * cols + nc
+                for nr in range(max(0, r - 1), min(rows, r + 2))
+                for nc in range(max(0, c - 1), min(cols, c + 2))
+                if hidden[nr, nc]
+            )
+            constraints[int(r) * cols + int(c)] = (cells, int(visible_board[r, c] - flagged_neighbors[r, c]))
+        return constraints
+
+    def propagate(self, constraints, safe=None, mines=None):
+        safe = set() if safe is None else set(safe)
+        mines = set() if mines is None else set(mines)
+        pending = {}
+        for cells, count in constraints:
+            pending[cells] = count
+
+        while True:
+            pending, changed = self._apply_known(pending, safe, mines)
+            if changed:
+                continue
+            if not self._reduce_subsets(pending):
+                break
+
+        return safe, mines, pending
+
+    def _apply_known(self, pending, safe, mines):
+        reduced = {}
+        changed = False
+        for cells, count in pending.items():
+            known_mines = len(cells & mines)
+            if known_mines or not cells.isdisjoint(safe):
+                cells = cells - safe - mines
+                count -= known_mines
+            if not cells:
+                continue
+
+            if count == 0:
+                safe |= cells
+                changed = True
+            elif count == len(cells):
+                mines |= cells
+                changed = True
+            elif cells not in reduced:
+                reduced[cells] = count
+        return reduced, changed
+
+    def _reduce_subsets(self, pending):
+        by_cell = {}
+        for cells in pending:
+            for cell in cells:
+                by_cell.setdefault(cell, []).append(cells)
+
+        # If A is a subset of B then B - A must hold exactly count(B) - count(A) mines.
+        derived = {}
+        for small, small_count in pending.items():
+            anchor = next(iter(small))
+            for large in by_cell[anchor]:
+                if len(large) <= len(small) or not small <= large:
+                    continue
+                rest = large - small
+                if rest not in pending and rest not in derived:
+                    derived[rest] = pending[large] - small_count
+
+        pending.update(derived)
+        return bool(derived)
+
+    def solve(self, visible_board):
+        constraints = self.build_constraints(visible_board)
+        safe, mines, _ = self.propagate(constraints.values())
+        return safe, mines
+
+    def find_moves(self, visible_board):
+        cols = visible_board.shape[1]
+        safe, mines = self.solve(visible_board)
+        moves = [(cell // cols, cell % cols, 0) for cell in sorted(safe)]
+        moves += [(cell // cols, cell % cols, 1) for cell in sorted(mines)]
+        return moves
@@ -0,0 +1,176 @@
+import time
+from collections import Counter, deque
+import numpy as np
+from ai.endgame_solver import EndgameSolver
+from ai.monte_carlo import MonteCarloEstimator
+from ai.probability_engine import ProbabilityEngine
+from ai.rule_based_solver import RuleBasedSolver
+from core.state_encoder import decode_state
+
+
+DEFAULT_TIERS = ("rules", "table", "constraints", "endgame", "probability", "monte_carlo", "cnn")
+
+# Seconds each tier may spend on one move. Only these tiers can stop a search early; the
+# deduction tiers are bounded by the board size and the CNN has a fixed cost.
+DEFAULT_BUDGETS = {
+    "endgame": 0.05,
+    "probability": 0.05,
+    "monte_carlo": 0.1,
+}
+
+
+class Decision:
+    def __init__(self, move, tier, elapsed, tier_times):
+        self.move = move
+        self.tier = tier
+        self.elapsed = elapsed
+        self.tier_times = tier_times
+
+    def __repr__(self):
+        return f"Decision(move={self.move}, tier={self.tier!r}, elapsed={self.elapsed * 1000:.1f}ms)"
+
+
+class DecisionPipeline:
+    def __init__(self, total_mines, cnn_policy=None, tiers=DEFAULT_TIERS, budgets=None,
+                 move_budget=0.25, max_guess_risk=0.25, history_size=1000):
+        self.total_mines = total_mines
+        self.cnn_policy = cnn_policy
+        self.tiers = list(tiers)
+        self.budgets = dict(DEFAULT_BUDGETS)
+        if budgets:
+            unbudgeted = [tier for tier in budgets if tier not in DEFAULT_BUDGETS]
+            if unbudgeted:
+                raise ValueError(f"These tiers cannot take a time budget: {unbudgeted}")
+            self.budgets.update(budgets)
+        self.move_budget = move_budget
+        self.max_guess_risk = max_guess_risk
+
+        self.rule_solver = RuleBasedSolver()
+        self.endgame_solver = EndgameSolver()
+        self.probability_engine = ProbabilityEngine()
+        self.history = deque(maxlen=history_size)
+
+        self.handlers = {
+            "rules": self._decide_rules,
+            "table": self._decide_table,
+            "constraints": self._decide_constraints,
+            "endgame": self._decide_endgame,
+            "probability": self._decide_probability,
+            "monte_carlo": self._decide_monte_carlo,
+            "cnn": self._decide_cnn,
+        }
+        unknown = [tier for tier in self.tiers if tier not in self.handlers]
+        if unknown:
+            raise ValueError(f"Unknown decision tiers: {unknown}")
+
+    def decide(self, board_tensor):
+        started = time.perf_counter()
+        deadline = started + self.move_budget if self.move_budget is not None else None
+        visible_board = decode_state(board_tensor)
+        self._fallback = None
+        tier_times = {}
+
+        move, decided_by = None, None
+        for tier in self.tiers:
+            budget = self.budgets.get(tier)
+            if deadline is not None:
+                left = deadline - time.perf_counter()
+                budget = left if budget is None else min(budget, left)
+                # Out of time: only the CNN, which has a fixed cost, is still worth asking.
+                if budget <= 0 and tier != "cnn":
+                    continue
+
+            tier_started = time.perf_counter()
+            move = self.handlers[tier](board_tensor, visible_board, budget)
+            tier_times[tier] = time.perf_counter() - tier_started
+            if move is not None:
+                decided_by = tier
+                break
+
+        if move is None:
+            move, decided_by = self._last_resort(visible_board)
+
+        decision = Decision(move, decided_by, time.perf_counter() - started, tier_times)
+        self.history.append(decision)
+        return decision
+
+    def tier_counts(self):
+        return Counter(decision.tier for decision in self.history)
+
+    def stats(self):
+        summary = {}
+        for tier, count in self.tier_counts().items():
+            latencies = sorted(decision.elapsed for decision in self.history if decision.tier == tier)
+            summary[tier] = {
+                "moves": count,
+                "mean_ms": 1000 * sum(latencies) / count,
+                "max_ms": 1000 * latencies[-1],
+            }
+        return summary
+
+    def reset_stats(self):
+        self.history.clear()
+
+    def _decide_rules(self, board_tensor, visible_board, budget):
+        return self.rule_solver.find_mask_move(visible_board)
+
+    def _decide_table(self, board_tensor, visible_board, budget):
+        return self.rule_solver.find_table_move(visible_board)
+
+    def _decide_constraints(self, board_tensor, visible_board, budget):
+        return self.rule_solver.find_constraint_move(visible_board)
+
+    def _decide_endgame(self, board_tensor, visible_board, budget):
+        self.endgame_solver.engine.time_budget = budget
+        return self.endgame_solver.find_move(visible_board, self.total_mines)
+
+    def _decide_probability(self, board_tensor, visible_board, budget):
+        self.probability_engine.time_budget = budget
+        result = self.probability_engine.compute(visible_board, self.total_mines)
+        return self._move_from_result(result, exact=True)
+
+    def _decide_monte_carlo(self, board_tensor, visible_board, budget):
+        estimator = MonteCarloEstimator(visible_board, self.total_mines)
+        if budget is None:
+            estimator.run(max_samples=2000)
+        else:
+            estimator.run(time_budget=budget)
+        return self._move_from_result(estimator.result(), exact=False)
+
+    def _decide_cnn(self, board_tensor, visible_board, budget):
+        if self.cnn_policy is None:
+            return None
+        row, col, action_type = self.cnn_policy(board_tensor)
+        return int(row), int(col), int(action_type)
+
+    def _move_from_result(self, result, exact):
+        if result is None:
+            return None
+        cols = result.probabilities.shape[1]
+        if result.safe:
+            row, col = divmod(min(result.safe), cols)
+            return row, col, 0
+        best = result.best_cell()
+        if best is None:
+            return None
+        # An exact answer is final; an estimate only decides when the risk is low enough,
+        # otherwise it is kept in case nothing later does better.
+        if exact or result.probabilities[best] <= self.max_guess_risk:
+            return best[0], best[1], 0
+        if self._fallback is None:
+            self._fallback = (best[0], best[1], 0)
+        return None
+
+    def _last_resort(self, visible_board):
+        if self._fallback is not None:
+            return self._fallback, "fallback"
+        hidden = np.argwhere(visible_board == -2)
+        if len(hidden):
+            row, col = hidden[np.random.randint(len(hidden))]
+            return (int(row), int(col), 0), "random"
+        # Every hidden cell is flagged but the game goes on, so one of the flags is wrong.
+        flagged = np.argwhere(visible_board == -3)
+        if len(flagged):
+            row, col = flagged[np.random.randint(len(flagged))]
+            return (int(row), int(col), 1), "unflag"
+        return None, None
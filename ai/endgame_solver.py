@@ -0,0 +1,65 @@
+from collections import OrderedDict
+import numpy as np
+from ai.probability_engine import ProbabilityEngine
+
+
+class EndgameSolver:
+    def __init__(self, max_hidden=24, max_entries=4096, max_nodes=200000, time_budget=0.05):
+        self.max_hidden = max_hidden
+        self.max_entries = max_entries
+        # The probability engine already weights every frontier component by the global
+        # mine count; this class adds the endgame cutoff, the per-position cache and moves.
+        self.engine = ProbabilityEngine(max_nodes=max_nodes, time_budget=time_budget)
+        self.cache = OrderedDict()
+
+    def applies(self, visible_board):
+        return 0 < int(np.sum(np.asarray(visible_board) == -2)) <= self.max_hidden
+
+    def solve(self, visible_board, total_mines):
+        # Returns None when the position is outside the endgame, no placement fits it, or
+        # the engine runs out of nodes or time.
+        board = np.asarray(visible_board, dtype=np.int8)
+        if not self.applies(board):
+            return None
+
+        key = (board.shape, board.tobytes(), total_mines)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        result = self.engine.compute(board, total_mines)
+        if result is None:
+            return None
+        self.cache[key] = result
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        return result
+
+    def find_move(self, visible_board, total_mines, exclude=None):
+        # Certain reveals first, then certain flags, then the lowest-risk reveal.
+        result = self.solve(visible_board, total_mines)
+        if result is None:
+            return None
+        cols = result.probabilities.shape[1]
+        excluded = {row * cols + col for row, col in exclude} if exclude else set()
+
+        safe = result.safe - excluded
+        if safe:
+            row, col = divmod(min(safe), cols)
+            return row, col, 0
+        mines = result.mines - excluded
+        if mines:
+            row, col = divmod(min(mines), cols)
+            return row, col, 1
+
+        probabilities = np.where(np.isnan(result.probabilities), np.inf, result.probabilities).ravel()
+        probabilities[list(excluded)] = np.inf
+        probabilities[list(result.mines)] = np.inf
+        flat_index = int(np.argmin(probabilities))
+        if not np.isfinite(probabilities[flat_index]):
+            return None
+        row, col = divmod(flat_index, cols)
+        return row, col, 0
+
+    def clear(self):
+        self.cache.clear()
@@ -0,0 +1,77 @@
+import argparse
+import json
+import time
+import numpy as np
+from ai.model_registry import get_compiled_model, get_model, resource_path
+
+DATASET_PATH = resource_path("dataset/final_moves_dataset.npz")
+
+
+class CompiledModel:
+    def __init__(self, model, warmup_calls=2):
+        import tensorflow as tf
+
+        # One fixed (1, rows, cols, channels) float32 signature, so the graph is traced once
+        # and later calls skip Keras' batching and retracing machinery entirely.
+        input_shape = tuple(model.input_shape[1:])
+        self.input_buffer = np.zeros((1,) + input_shape, dtype=np.float32)
+        self._forward = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec((1,) + input_shape, tf.float32)],
+        )
+        for _ in range(warmup_calls):
+            self._forward(self.input_buffer)
+
+    def predict(self, board_tensor):
+        # Returns the flat output for a single rows x cols x channels board.
+        self.input_buffer[0] = board_tensor
+        return self._forward(self.input_buffer).numpy().reshape(-1)
+
+
+def load_positions(path=DATASET_PATH, count=None):
+    with np.load(path) as data:
+        positions = data["X"]
+    return positions if count is None else positions[:count]
+
+
+def measure_latency(predict, boards, warmup=10):
+    for board in boards[:warmup]:
+        predict(board)
+    timings = []
+    for board in boards:
+        started = time.perf_counter()
+        predict(board)
+        timings.append(time.perf_counter() - started)
+    timings = np.array(timings) * 1000
+    return {
+        "moves": len(timings),
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "mean_ms": float(timings.mean()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-move latency of model.predict and the compiled path.")
+    parser.add_argument("--moves", type=int, default=500, help="number of dataset positions to time")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    boards = load_positions(count=args.moves)
+    model = get_model()
+    compiled = get_compiled_model()
+
+    report = {
+        "model.predict": measure_latency(lambda board: model.predict(board[np.newaxis], verbose=0)[0], boards),
+        "compiled": measure_latency(compiled.predict, boards),
+    }
+    for name, stats in report.items():
+        print(f"{name:<14} p50 {stats['p50_ms']:7.3f} ms   p99 {stats['p99_ms']:7.3f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
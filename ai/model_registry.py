@@ -0,0 +1,95 @@
+import sys
+import os
+import threading
+
+
+def mean_iou(y_true, y_pred): return 0.0
+
+
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+MODEL_PATH = resource_path("model/final_rl_model.keras")
+NUMPY_MODEL_PATH = resource_path("model/final_rl_model.npz")
+INT8_MODEL_PATH = resource_path("model/final_rl_model_int8.npz")
+
+
+_model = None
+_compiled_model = None
+_inference_model = None
+_lock = threading.RLock()
+_preload_thread = None
+
+
+def get_model():
+    # Every AIAgent shares one model; callers block here while a preload is running.
+    global _model
+    with _lock:
+        if _model is None:
+            if not os.path.exists(MODEL_PATH):
+                raise FileNotFoundError(f"Could not find the trained model file at: {MODEL_PATH}")
+            # TensorFlow is imported here, not at module level, so nothing pays for it
+            # until a model is actually needed.
+            from tensorflow.keras.models import load_model
+            _model = load_model(MODEL_PATH, custom_objects={'mean_iou': mean_iou}, compile=False)
+        return _model
+
+
+def get_compiled_model():
+    # The traced, warmed-up wrapper is shared the same way as the model it wraps.
+    global _compiled_model
+    with _lock:
+        if _compiled_model is None:
+            from ai.inference import CompiledModel
+            _compiled_model = CompiledModel(get_model())
+        return _compiled_model
+
+
+def get_inference_model():
+    # Prefers the exported NumPy weights, which need no TensorFlow at all (the int8 export
+    # when one has been made), and falls back to the compiled Keras model otherwise.
+    global _inference_model
+    with _lock:
+        if _inference_model is None:
+            if os.path.exists(INT8_MODEL_PATH):
+                from ai.quantization import QuantizedNumpyModel
+                _inference_model = QuantizedNumpyModel.load(INT8_MODEL_PATH)
+            elif os.path.exists(NUMPY_MODEL_PATH):
+                from ai.numpy_model import NumpyModel
+                _inference_model = NumpyModel.load(NUMPY_MODEL_PATH)
+            else:
+                _inference_model = get_compiled_model()
+        return _inference_model
+
+
+def is_loaded():
+    return _inference_model is not None
+
+
+def has_numpy_model():
+    return os.path.exists(INT8_MODEL_PATH) or os.path.exists(NUMPY_MODEL_PATH)
+
+
+def preload(allow_tensorflow=False):
+    # Starts loading on a daemon thread so it overlaps with time spent on the menu. Only
+    # the NumPy exports are preloaded by default; the Keras fallback imports TensorFlow,
+    # which must not happen until AI mode is actually chosen.
+    global _preload_thread
+    if _inference_model is not None or (_preload_thread is not None and _preload_thread.is_alive()):
+        return _preload_thread
+    if not allow_tensorflow and not has_numpy_model():
+        return None
+
+    def load():
+        try:
+            get_inference_model()
+        except Exception as e:
+            print(f"Warning: Could not preload the AI model: {e}")
+
+    _preload_thread = threading.Thread(target=load, name="model-preload", daemon=True)
+    _preload_thread.start()
+    return _preload_thread
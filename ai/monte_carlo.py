@@ -0,0 +1,245 @@
+import time
+from math import lgamma
+import numpy as np
+from ai.constraint_engine import ConstraintEngine
+from ai.probability_engine import BudgetExceeded, ProbabilityResult
+
+
+def _log_comb(n, k):
+    if k < 0 or k > n:
+        return -np.inf
+    return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+
+
+class MonteCarloEstimator:
+    def __init__(self, visible_board, total_mines, seed=None, block_size=20, max_init_nodes=200000):
+        self.rng = np.random.default_rng(seed)
+        self.block_size = block_size
+        self.max_init_nodes = max_init_nodes
+
+        board = np.asarray(visible_board)
+        self.shape = board.shape
+        engine = ConstraintEngine()
+        constraints = engine.build_constraints(board)
+        safe, mines, pending = engine.propagate(constraints.values())
+
+        hidden = set(np.flatnonzero(board == -2).tolist())
+        frontier = set().union(*pending) if pending else set()
+        self.hidden_cells = sorted(hidden)
+        self.known_safe = sorted(safe)
+        self.known_mines = sorted(mines)
+        self.interior_cells = sorted(hidden - frontier - safe - mines)
+        self.remaining = total_mines - int(np.sum(board == -3)) - len(mines)
+
+        self.variables = sorted(frontier)
+        index = {cell: i for i, cell in enumerate(self.variables)}
+        self.constraint_vars = [[index[cell] for cell in cells] for cells in pending]
+        self.constraint_counts = list(pending.values())
+        self.var_constraints = [[] for _ in self.variables]
+        for c, variables in enumerate(self.constraint_vars):
+            for v in variables:
+                self.var_constraints[v].append(c)
+        self.var_neighbors = [
+            sorted({u for c in constraint_ids for u in self.constraint_vars[c]} - {v})
+            for v, constraint_ids in enumerate(self.var_constraints)
+        ]
+
+        # Weight of a frontier assignment with k mines is C(interior, remaining - k).
+        interior = len(self.interior_cells)
+        self.log_weights = np.array([_log_comb(interior, self.remaining - k) for k in range(len(self.variables) + 1)])
+
+        self.state = None
+        self.state_mines = 0
+        self.samples = 0
+        self.mine_counts = np.zeros(len(self.variables))
+        self.interior_mines = 0.0
+        self.elapsed = 0.0
+
+    @classmethod
+    def from_env(cls, env, **kwargs):
+        return cls(env.visible_board, env.bombs, **kwargs)
+
+    def run(self, deadline=None, time_budget=None, max_samples=None):
+        if time_budget is not None:
+            budget_deadline = time.perf_counter() + time_budget
+            deadline = budget_deadline if deadline is None else min(deadline, budget_deadline)
+        if deadline is None and max_samples is None:
+            raise ValueError("Give run() a deadline, a time_budget or max_samples so it can stop.")
+
+        started = time.perf_counter()
+        try:
+            if self.state is None:
+                self._initialize(deadline)
+            taken = 0
+            while max_samples is None or taken < max_samples:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                self._gibbs_step(deadline)
+                self.mine_counts += self.state
+                self.interior_mines += self.remaining - self.state_mines
+                self.samples += 1
+                taken += 1
+        except BudgetExceeded:
+            pass
+        self.elapsed += time.perf_counter() - started
+        return self
+
+    def probabilities(self):
+        rows, cols = self.shape
+        probabilities = np.full(rows * cols, np.nan)
+        if self.samples == 0 and self.variables:
+            return probabilities.reshape(rows, cols)
+
+        probabilities[self.hidden_cells] = 0.0
+        if self.known_mines:
+            probabilities[self.known_mines] = 1.0
+        if self.variables:
+            probabilities[self.variables] = self.mine_counts / self.samples
+        if self.interior_cells:
+            if self.variables:
+                expected = self.interior_mines / self.samples
+            else:
+                expected = self.remaining
+            probabilities[self.interior_cells] = expected / len(self.interior_cells)
+        return probabilities.reshape(rows, cols)
+
+    def result(self):
+        # Only the cells the constraint engine proved are reported as certain; a sampled
+        # frequency of 0 or 1 is an estimate, not a deduction.
+        if self.samples == 0 and self.variables:
+            return None
+        return ProbabilityResult(
+            self.probabilities(), set(self.known_safe), set(self.known_mines),
+            self.samples, self.elapsed,
+        )
+
+    def _initialize(self, deadline):
+        # Randomised backtracking for one assignment that satisfies every constraint.
+        # Cells are visited constraint by constraint, so a wrong choice is caught by the
+        # constraint it breaks a few levels later rather than after the whole frontier.
+        order = []
+        seen = set()
+        for c in sorted(range(len(self.constraint_vars)), key=lambda c: len(self.constraint_vars[c])):
+            pending = [c]
+            while pending:
+                constraint = pending.pop()
+                for v in self.constraint_vars[constraint]:
+                    if v not in seen:
+                        seen.add(v)
+                        order.append(v)
+                        pending.extend(self.var_constraints[v])
+
+        count = len(order)
+        interior = len(self.interior_cells)
+        needed = list(self.constraint_counts)
+        unassigned = [len(variables) for variables in self.constraint_vars]
+        state = np.zeros(count, dtype=np.int8)
+        nodes = 0
+
+        def search(depth, mines):
+            nonlocal nodes
+            nodes += 1
+            if nodes > self.max_init_nodes:
+                raise BudgetExceeded()
+            if deadline is not None and nodes % 64 == 0 and time.perf_counter() >= deadline:
+                raise BudgetExceeded()
+            # The mines still to place must fit in the remaining frontier plus the interior.
+            left = self.remaining - mines
+            if left < 0 or left > count - depth + interior:
+                return False
+            if depth == count:
+                return np.isfinite(self.log_weights[mines])
+
+            v = order[depth]
+            first = int(self.rng.integers(2))
+            for value in (first, 1 - first):
+                valid = True
+                for c in self.var_constraints[v]:
+                    unassigned[c] -= 1
+                    needed[c] -= value
+                    if needed[c] < 0 or needed[c] > unassigned[c]:
+                        valid = False
+                if valid:
+                    state[v] = value
+                    if search(depth + 1, mines + value):
+                        return True
+                for c in self.var_constraints[v]:
+                    unassigned[c] += 1
+                    needed[c] += value
+            state[v] = 0
+            return False
+
+        if not search(0, 0):
+            # No assignment fits the board; treat it like running out of budget.
+            raise BudgetExceeded()
+        self.state = state
+        self.state_mines = int(state.sum())
+
+    def _gibbs_step(self, deadline=None):
+        if not self.variables:
+            return
+
+        # Resample a block of cells grown outwards through shared constraints from one
+        # random cell, drawing from its exact conditional given everything outside it.
+        # Growing the block lets coupled chains along the frontier shift as a whole.
+        start = int(self.rng.integers(len(self.variables)))
+        block = [start]
+        in_block = {start}
+        head = 0
+        while head < len(block) and len(block) < self.block_size:
+            neighbors = self.var_neighbors[block[head]]
+            for u in self.rng.permutation(neighbors) if neighbors else ():
+                u = int(u)
+                if u not in in_block:
+                    block.append(u)
+                    in_block.add(u)
+                    if len(block) == self.block_size:
+                        break
+            head += 1
+
+        touched = sorted({c for u in block for c in self.var_constraints[u]})
+        needed = {}
+        unassigned = {}
+        for c in touched:
+            inside = [u for u in self.constraint_vars[c] if u in in_block]
+            needed[c] = self.constraint_counts[c] - sum(int(self.state[u]) for u in self.constraint_vars[c] if u not in in_block)
+            unassigned[c] = len(inside)
+
+        block_mines = sum(int(self.state[u]) for u in block)
+        outside_mines = self.state_mines - block_mines
+        options = []
+        assignment = [0] * len(block)
+
+        nodes = 0
+
+        def search(depth, mines):
+            nonlocal nodes
+            nodes += 1
+            if deadline is not None and nodes % 64 == 0 and time.perf_counter() >= deadline:
+                raise BudgetExceeded()
+            if depth == len(block):
+                options.append((tuple(assignment), mines))
+                return
+            u = block[depth]
+            for value in (0, 1):
+                valid = True
+                for c in self.var_constraints[u]:
+                    unassigned[c] -= 1
+                    needed[c] -= value
+                    if needed[c] < 0 or needed[c] > unassigned[c]:
+                        valid = False
+                if valid:
+                    assignment[depth] = value
+                    search(depth + 1, mines + value)
+                for c in self.var_constraints[u]:
+                    unassigned[c] += 1
+                    needed[c] += value
+
+        search(0, 0)
+        log_weights = np.array([self.log_weights[outside_mines + mines] for _, mines in options])
+        weights = np.exp(log_weights - log_weights.max())
+        choice = options[int(self.rng.choice(len(options), p=weights / weights.sum()))]
+
+        for u, value in zip(block, choice[0]):
+            self.state[u] = value
+        self.state_mines = outside_mines + choice[1]
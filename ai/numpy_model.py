@@ -0,0 +1,330 @@
+import argparse
+import json
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from ai.model_registry import NUMPY_MODEL_PATH
+
+
+def _linear(x):
+    return x
+
+
+def _relu(x):
+    return np.maximum(x, 0)
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _softmax(x):
+    shifted = np.exp(x - x.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+def _elu(x):
+    return np.where(x > 0, x, np.expm1(np.minimum(x, 0)))
+
+
+def _selu(x):
+    return 1.0507009873554805 * np.where(x > 0, x, 1.6732632423543772 * np.expm1(np.minimum(x, 0)))
+
+
+def _softplus(x):
+    return np.logaddexp(0, x)
+
+
+def _swish(x):
+    return x * _sigmoid(x)
+
+
+def _gelu(x):
+    return 0.5 * x * (1.0 + np.tanh(0.7978845608028654 * (x + 0.044715 * x ** 3)))
+
+
+ACTIVATIONS = {
+    "linear": _linear,
+    "relu": _relu,
+    "sigmoid": _sigmoid,
+    "softmax": _softmax,
+    "tanh": np.tanh,
+    "elu": _elu,
+    "selu": _selu,
+    "softplus": _softplus,
+    "swish": _swish,
+    "silu": _swish,
+    "gelu": _gelu,
+}
+
+
+def get_activation(activation):
+    if activation is None:
+        return _linear
+    if isinstance(activation, dict):
+        activation = activation.get("config", {}).get("name", activation.get("class_name"))
+    if activation not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation: {activation}")
+    return ACTIVATIONS[activation]
+
+
+def _pad_amounts(size, kernel, stride, padding):
+    if padding == "valid":
+        return 0, 0
+    out = -(-size // stride)
+    total = max((out - 1) * stride + kernel - size, 0)
+    return total // 2, total - total // 2
+
+
+def _windows(x, kernel_size, strides, padding, dilation=(1, 1), pad_value=0.0):
+    # (N, H, W, C) -> (N, H', W', kh, kw, C) views of every receptive field.
+    kh, kw = kernel_size
+    dh, dw = dilation
+    eff_h, eff_w = (kh - 1) * dh + 1, (kw - 1) * dw + 1
+    top, bottom = _pad_amounts(x.shape[1], eff_h, strides[0], padding)
+    left, right = _pad_amounts(x.shape[2], eff_w, strides[1], padding)
+    if top or bottom or left or right:
+        x = np.pad(x, ((0, 0), (top, bottom), (left, right), (0, 0)), constant_values=pad_value)
+    windows = sliding_window_view(x, (eff_h, eff_w), axis=(1, 2))
+    windows = windows[:, ::strides[0], ::strides[1], :, ::dh, ::dw]
+    return windows.transpose(0, 1, 2, 4, 5, 3)
+
+
+def im2col(x, kernel_size, strides=(1, 1), padding="valid", dilation=(1, 1)):
+    # Gathers each receptive field into one row; returns the rows and the output grid shape.
+    windows = _windows(x, kernel_size, strides, padding, dilation)
+    n, out_h, out_w = windows.shape[:3]
+    return windows.reshape(n * out_h * out_w, -1), (n, out_h, out_w)
+
+
+def conv2d(x, kernel, bias, strides=(1, 1), padding="valid", dilation=(1, 1)):
+    # im2col, then one matmul against the kernel.
+    kh, kw, channels, filters = kernel.shape
+    columns, grid = im2col(x, (kh, kw), strides, padding, dilation)
+    out = columns @ kernel.reshape(kh * kw * channels, filters)
+    if bias is not None:
+        out += bias
+    return out.reshape(grid + (filters,))
+
+
+def _conv2d_layer(config, weights, x):
+    kernel = weights[0]
+    bias = weights[1] if config.get("use_bias", True) and len(weights) > 1 else None
+    out = conv2d(
+        x, kernel, bias, tuple(config.get("strides", (1, 1))),
+        config.get("padding", "valid"), tuple(config.get("dilation_rate", (1, 1))),
+    )
+    return get_activation(config.get("activation"))(out)
+
+
+def _dense_layer(config, weights, x):
+    out = x @ weights[0]
+    if config.get("use_bias", True) and len(weights) > 1:
+        out += weights[1]
+    return get_activation(config.get("activation"))(out)
+
+
+def _batch_norm_layer(config, weights, x):
+    weights = list(weights)
+    gamma = weights.pop(0) if config.get("scale", True) else 1.0
+    beta = weights.pop(0) if config.get("center", True) else 0.0
+    mean, variance = weights
+    return (x - mean) / np.sqrt(variance + config.get("epsilon", 1e-3)) * gamma + beta
+
+
+def _pool(x, config, reduce, pad_value):
+    pool_size = tuple(config.get("pool_size", (2, 2)))
+    strides = tuple(config.get("strides") or pool_size)
+    windows = _windows(x, pool_size, strides, config.get("padding", "valid"), pad_value=pad_value)
+    return reduce(windows, axis=(3, 4))
+
+
+def _reshape_layer(config, weights, x):
+    return x.reshape((x.shape[0],) + tuple(config["target_shape"]))
+
+
+def _leaky_relu_layer(config, weights, x):
+    slope = config.get("negative_slope", config.get("alpha", 0.3))
+    return np.where(x > 0, x, slope * x)
+
+
+def _relu_layer(config, weights, x):
+    out = np.maximum(x, 0)
+    if config.get("max_value") is not None:
+        out = np.minimum(out, config["max_value"])
+    return out
+
+
+def _identity_layer(config, weights, x):
+    return x
+
+
+SINGLE_INPUT_LAYERS = {
+    "InputLayer": _identity_layer,
+    "Conv2D": _conv2d_layer,
+    "Dense": _dense_layer,
+    "Flatten": lambda config, weights, x: x.reshape(x.shape[0], -1),
+    "Reshape": _reshape_layer,
+    "Activation": lambda config, weights, x: get_activation(config["activation"])(x),
+    "ReLU": _relu_layer,
+    "LeakyReLU": _leaky_relu_layer,
+    "Softmax": lambda config, weights, x: _softmax(x),
+    "BatchNormalization": _batch_norm_layer,
+    "MaxPooling2D": lambda config, weights, x: _pool(x, config, np.max, -np.inf),
+    "AveragePooling2D": lambda config, weights, x: _pool(x, config, np.mean, 0.0),
+    "GlobalAveragePooling2D": lambda config, weights, x: x.mean(axis=(1, 2)),
+    "GlobalMaxPooling2D": lambda config, weights, x: x.max(axis=(1, 2)),
+    "Dropout": _identity_layer,
+    "SpatialDropout2D": _identity_layer,
+    "GaussianNoise": _identity_layer,
+    "GaussianDropout": _identity_layer,
+}
+
+MERGE_LAYERS = {
+    "Add": lambda config, inputs: sum(inputs[1:], inputs[0]),
+    "Subtract": lambda config, inputs: inputs[0] - inputs[1],
+    "Multiply": lambda config, inputs: np.prod(np.stack(inputs), axis=0),
+    "Average": lambda config, inputs: np.mean(np.stack(inputs), axis=0),
+    "Maximum": lambda config, inputs: np.max(np.stack(inputs), axis=0),
+    "Minimum": lambda config, inputs: np.min(np.stack(inputs), axis=0),
+    "Concatenate": lambda config, inputs: np.concatenate(inputs, axis=config.get("axis", -1)),
+}
+
+MODEL_INPUT = "__input__"
+
+
+class NumpyModel:
+    def __init__(self, layers, outputs, weights, input_shape):
+        unsupported = sorted({
+            layer["class_name"] for layer in layers
+            if layer["class_name"] not in SINGLE_INPUT_LAYERS and layer["class_name"] not in MERGE_LAYERS
+        })
+        if unsupported:
+            raise ValueError(f"Unsupported layers for the NumPy model: {unsupported}")
+        self.layers = layers
+        self.outputs = outputs
+        self.weights = weights
+        self.input_shape = tuple(input_shape)
+
+    @classmethod
+    def load(cls, path=NUMPY_MODEL_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            spec = json.loads(str(data["spec"]))
+            weights = {
+                layer["name"]: [data[f"{layer['name']}/{i}"] for i in range(layer["num_weights"])]
+                for layer in spec["layers"]
+            }
+        return cls(spec["layers"], spec["outputs"], weights, spec["input_shape"])
+
+    def forward(self, batch):
+        values = {MODEL_INPUT: np.asarray(batch, dtype=np.float32)}
+        for layer in self.layers:
+            out = self._apply_layer(layer, [values[name] for name in layer["inbound"]])
+            values[layer["name"]] = out.astype(np.float32, copy=False)
+        return values[self.outputs[0]]
+
+    def _apply_layer(self, layer, inputs):
+        if layer["class_name"] in MERGE_LAYERS:
+            return MERGE_LAYERS[layer["class_name"]](layer["config"], inputs)
+        return SINGLE_INPUT_LAYERS[layer["class_name"]](layer["config"], self.weights[layer["name"]], inputs[0])
+
+    def predict(self, board_tensor):
+        # Same contract as CompiledModel.predict: one board in, the flat output back.
+        return self.forward(np.asarray(board_tensor)[np.newaxis]).reshape(-1)
+
+
+def _history_names(node):
+    # Collects source layer names from inbound-node records of both Keras 2
+    # ([name, node_index, tensor_index, kwargs]) and Keras 3 (keras_history dicts).
+    if isinstance(node, dict):
+        if "keras_history" in node.get("config", {}):
+            return [node["config"]["keras_history"][0]]
+        return [name for value in node.values() for name in _history_names(value)]
+    if isinstance(node, (list, tuple)):
+        if len(node) >= 3 and isinstance(node[0], str) and isinstance(node[1], int):
+            return [node[0]]
+        return [name for item in node for name in _history_names(item)]
+    return []
+
+
+def _layer_names(entries):
+    if entries and isinstance(entries[0], str):
+        entries = [entries]
+    return [entry[0] for entry in entries]
+
+
+def describe_keras_model(model):
+    # Flattens a Sequential or functional Keras model into layers with named inputs.
+    config = model.get_config()
+    live_layers = {layer.name: layer for layer in model.layers}
+    layers = []
+
+    if "input_layers" in config:
+        input_names = set(_layer_names(config["input_layers"]))
+        if len(input_names) != 1:
+            raise ValueError("The NumPy model only supports a single model input.")
+        for layer_config in config["layers"]:
+            name = layer_config["name"] if "name" in layer_config else layer_config["config"]["name"]
+            inbound = [MODEL_INPUT] if name in input_names else _history_names(layer_config["inbound_nodes"])
+            layers.append((name, layer_config["class_name"], inbound))
+        outputs = _layer_names(config["output_layers"])
+    else:
+        previous = MODEL_INPUT
+        for layer in model.layers:
+            layers.append((layer.name, type(layer).__name__, [previous]))
+            previous = layer.name
+        outputs = [previous]
+
+    described = []
+    for name, class_name, inbound in layers:
+        live = live_layers.get(name)
+        described.append({
+            "name": name,
+            "class_name": class_name,
+            "config": live.get_config() if live is not None else {},
+            "inbound": inbound,
+            "weights": [np.asarray(w, dtype=np.float32) for w in live.get_weights()] if live is not None else [],
+        })
+    return described, outputs
+
+
+def export_numpy_model(model, path=NUMPY_MODEL_PATH):
+    described, outputs = describe_keras_model(model)
+    spec = {
+        "layers": [
+            dict({key: layer[key] for key in ("name", "class_name", "config", "inbound")}, num_weights=len(layer["weights"]))
+            for layer in described
+        ],
+        "outputs": outputs,
+        "input_shape": list(model.input_shape[1:]),
+    }
+    arrays = {
+        f"{layer['name']}/{i}": weight
+        for layer in described for i, weight in enumerate(layer["weights"])
+    }
+    np.savez(path, spec=json.dumps(spec, default=str), **arrays)
+    return NumpyModel.load(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the Keras model to a NumPy .npz and check it matches.")
+    parser.add_argument("--output", default=NUMPY_MODEL_PATH, help="where to write the .npz")
+    parser.add_argument("--check", type=int, default=500, help="dataset positions to compare against Keras")
+    args = parser.parse_args(argv)
+
+    from ai.inference import load_positions
+    from ai.model_registry import get_model
+
+    model = get_model()
+    numpy_model = export_numpy_model(model, args.output)
+    print(f"Exported {len(numpy_model.layers)} layers to {args.output}")
+
+    if args.check:
+        boards = load_positions(count=args.check)
+        expected = np.asarray(model.predict(boards, verbose=0)).reshape(len(boards), -1)
+        actual = numpy_model.forward(boards).reshape(len(boards), -1)
+        print(f"Max abs difference: {np.abs(expected - actual).max():.2e}")
+        print(f"Argmax agreement: {np.mean(expected.argmax(axis=1) == actual.argmax(axis=1)):.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import json
+import os
+from collections import OrderedDict
+
+
+SYMMETRIES = [
+    lambda r, c: (r, c),
+    lambda r, c: (r, -c),
+    lambda r, c: (-r, c),
+    lambda r, c: (-r, -c),
+    lambda r, c: (c, r),
+    lambda r, c: (c, -r),
+    lambda r, c: (-c, r),
+    lambda r, c: (-c, -r),
+]
+
+
+def canonical_pattern(constraints, cols):
+    cells = set().union(*(cells for cells, _ in constraints))
+
+    best_key = None
+    best_mapping = None
+    for transform in SYMMETRIES:
+        mapped = {cell: transform(*divmod(cell, cols)) for cell in cells}
+        min_r = min(r for r, _ in mapped.values())
+        min_c = min(c for _, c in mapped.values())
+        mapped = {cell: (r - min_r, c - min_c) for cell, (r, c) in mapped.items()}
+
+        key = tuple(sorted(
+            (tuple(sorted(mapped[cell] for cell in constraint_cells)), count)
+            for constraint_cells, count in constraints
+        ))
+        if best_key is None or key < best_key:
+            best_key = key
+            best_mapping = mapped
+
+    # Board cells listed in canonical order, so cached per-cell results map straight back.
+    ordered_cells = sorted(cells, key=lambda cell: best_mapping[cell])
+    return best_key, ordered_cells
+
+
+class PatternCache:
+    def __init__(self, max_entries=50000, min_cells=6, max_cells=40):
+        self.max_entries = max_entries
+        self.min_cells = min_cells
+        self.max_cells = max_cells
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def accepts(self, num_cells):
+        # Tiny components enumerate faster than they canonicalize; huge ones rarely repeat.
+        return self.min_cells <= num_cells <= self.max_cells
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        records = [[key, value] for key, value in self.entries.items()]
+        with open(path, 'w') as f:
+            json.dump(records, f)
+
+    def load(self, path):
+        if not os.path.exists(path):
+            return
+        with open(path, 'r') as f:
+            try:
+                records = json.load(f)
+            except json.JSONDecodeError:
+                print("Warning: Could not read pattern cache, starting empty.")
+                return
+        for key, value in records:
+            self.put(_to_tuple(key), _to_tuple(value))
+
+
+def _to_tuple(value):
+    if isinstance(value, list):
+        return tuple(_to_tuple(item) for item in value)
+    return value
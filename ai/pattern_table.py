@@ -0,0 +1,129 @@
+import os
+import numpy as np
+from ai.model_registry import resource_path
+from core.board_generator import count_neighbors
+
+PATTERN_TABLE_PATH = resource_path("dataset/pattern_table.npy")
+
+# The table covers two horizontally adjacent revealed numbers, A at window (1, 1) and
+# B at (1, 2), plus the 10 other cells of the 3x4 window around them.
+WINDOW_OFFSETS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1, 2) if (dr, dc) not in ((0, 0), (0, 1))]
+NUM_WINDOW_CELLS = len(WINDOW_OFFSETS)
+LEFT_BITS = sum(1 << i for i, (_, dc) in enumerate(WINDOW_OFFSETS) if dc <= 1)
+RIGHT_BITS = sum(1 << i for i, (_, dc) in enumerate(WINDOW_OFFSETS) if dc >= 0)
+
+# Key layout: 10 hidden bits, then 4 bits of mines left around A, then 4 around B.
+COUNT_BITS = 4
+TABLE_SIZE = 1 << (NUM_WINDOW_CELLS + 2 * COUNT_BITS)
+WINDOW_MASK = (1 << NUM_WINDOW_CELLS) - 1
+
+
+def pack_key(hidden_bits, left_remaining, right_remaining):
+    return hidden_bits | (left_remaining << NUM_WINDOW_CELLS) | (right_remaining << (NUM_WINDOW_CELLS + COUNT_BITS))
+
+
+def build_pattern_table():
+    # Entry = forced-safe bits | forced-mine bits << 10; 0 means nothing is forced.
+    table = np.zeros(TABLE_SIZE, dtype=np.uint32)
+    assignments = np.arange(1 << NUM_WINDOW_CELLS, dtype=np.uint32)
+    bit_counts = np.array([bin(a).count("1") for a in range(1 << NUM_WINDOW_CELLS)])
+    left_counts = bit_counts[assignments & LEFT_BITS]
+    right_counts = bit_counts[assignments & RIGHT_BITS]
+
+    for hidden_bits in range(1 << NUM_WINDOW_CELLS):
+        inside = (assignments & ~np.uint32(hidden_bits)) == 0
+        candidates = assignments[inside]
+        lefts = left_counts[inside]
+        rights = right_counts[inside]
+        for left in range(9):
+            for right in range(9):
+                solutions = candidates[(lefts == left) & (rights == right)]
+                if len(solutions) == 0:
+                    continue
+                ever_mine = np.bitwise_or.reduce(solutions)
+                always_mine = np.bitwise_and.reduce(solutions)
+                safe = hidden_bits & ~int(ever_mine) & WINDOW_MASK
+                mines = int(always_mine)
+                table[pack_key(hidden_bits, left, right)] = safe | (mines << NUM_WINDOW_CELLS)
+    return table
+
+
+def save_pattern_table(path=PATTERN_TABLE_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    np.save(path, build_pattern_table())
+
+
+_pattern_table = None
+
+
+def load_pattern_table(path=PATTERN_TABLE_PATH):
+    global _pattern_table
+    if _pattern_table is None:
+        if os.path.exists(path):
+            _pattern_table = np.load(path, mmap_mode="r")
+        else:
+            print(f"Warning: {path} not found, building the pattern table in memory.")
+            _pattern_table = build_pattern_table()
+    return _pattern_table
+
+
+def _lookup_horizontal(board, remaining, table):
+    rows, cols = board.shape
+    padded = np.pad(board, 1, constant_values=-1)
+    hidden = padded == -2
+
+    # Every pair of horizontally adjacent revealed numbers, as (row, col) of the left one.
+    pair = (board[:, :-1] >= 0) & (board[:, 1:] >= 0)
+    left_remaining = remaining[:, :-1]
+    right_remaining = remaining[:, 1:]
+    pair &= (left_remaining >= 0) & (left_remaining <= 8) & (right_remaining >= 0) & (right_remaining <= 8)
+    pair_rows, pair_cols = np.nonzero(pair)
+    if len(pair_rows) == 0:
+        return np.empty((0, 5), dtype=int)
+
+    hidden_bits = np.zeros(len(pair_rows), dtype=np.int64)
+    for i, (dr, dc) in enumerate(WINDOW_OFFSETS):
+        hidden_bits |= hidden[pair_rows + 1 + dr, pair_cols + 1 + dc].astype(np.int64) << i
+
+    keys = pack_key(
+        hidden_bits,
+        left_remaining[pair_rows, pair_cols].astype(np.int64),
+        right_remaining[pair_rows, pair_cols].astype(np.int64),
+    )
+    entries = np.asarray(table[keys]).astype(np.int64)
+    found = entries != 0
+    pair_rows, pair_cols, entries = pair_rows[found], pair_cols[found], entries[found]
+
+    moves = []
+    for i, (dr, dc) in enumerate(WINDOW_OFFSETS):
+        for action_type, shift in ((0, i), (1, i + NUM_WINDOW_CELLS)):
+            hit = (entries >> shift) & 1 == 1
+            if np.any(hit):
+                src_r, src_c = pair_rows[hit], pair_cols[hit]
+                moves.append(np.stack([
+                    src_r + dr, src_c + dc, np.full(len(src_r), action_type), src_r, src_c,
+                ], axis=1))
+    if not moves:
+        return np.empty((0, 5), dtype=int)
+    return np.concatenate(moves)
+
+
+def lookup_moves(visible_board, table=None):
+    # Returns an array of (row, col, action_type, source_row, source_col) rows; pairs are
+    # looked up along rows and, through the transpose, along columns.
+    if table is None:
+        table = load_pattern_table()
+    board = np.asarray(visible_board)
+    remaining = board.astype(np.int16) - count_neighbors(board == -3)
+
+    horizontal = _lookup_horizontal(board, remaining, table)
+    vertical = _lookup_horizontal(board.T, remaining.T, table)[:, [1, 0, 2, 4, 3]]
+    moves = np.concatenate([horizontal, vertical])
+    if len(moves) == 0:
+        return moves
+    # Safe moves first, then by position, without duplicates.
+    _, first = np.unique(moves[:, :3], axis=0, return_index=True)
+    moves = moves[np.sort(first)]
+    return moves[np.lexsort((moves[:, 1], moves[:, 0], moves[:, 2]))]
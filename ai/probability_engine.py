@@ -0,0 +1,209 @@
+import time
+from math import comb
+import numpy as np
+from ai.constraint_engine import ConstraintEngine
+from ai.pattern_cache import canonical_pattern
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+class ProbabilityResult:
+    def __init__(self, probabilities, safe, mines, nodes, elapsed):
+        self.probabilities = probabilities
+        self.safe = safe
+        self.mines = mines
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def best_cell(self):
+        probabilities = np.where(np.isnan(self.probabilities), np.inf, self.probabilities)
+        flat_index = int(np.argmin(probabilities))
+        if not np.isfinite(probabilities.flat[flat_index]):
+            return None
+        return divmod(flat_index, self.probabilities.shape[1])
+
+
+class ProbabilityEngine:
+    def __init__(self, max_nodes=200000, time_budget=0.05, pattern_cache=None):
+        self.max_nodes = max_nodes
+        self.time_budget = time_budget
+        self.pattern_cache = pattern_cache
+        self.constraint_engine = ConstraintEngine()
+
+    def compute(self, visible_board, total_mines):
+        started = time.perf_counter()
+        self.nodes = 0
+        self.deadline = started + self.time_budget if self.time_budget is not None else None
+
+        rows, cols = visible_board.shape
+        constraints = self.constraint_engine.build_constraints(visible_board)
+        safe, mines, pending = self.constraint_engine.propagate(constraints.values())
+
+        hidden = set(np.flatnonzero(visible_board == -2).tolist())
+        frontier = set().union(*pending) if pending else set()
+        interior = len(hidden - frontier - safe - mines)
+        remaining = total_mines - int(np.sum(visible_board == -3)) - len(mines)
+
+        try:
+            components = [self._solve_component(cells, pending, cols) for cells in self._split_components(pending)]
+        except BudgetExceeded:
+            return None
+
+        weights = self._combine(components, interior, remaining)
+        if weights is None:
+            return None
+        total = sum(weights.values())
+
+        probabilities = np.full(rows * cols, np.nan)
+        probabilities[list(hidden)] = 0.0
+        if mines:
+            probabilities[list(mines)] = 1.0
+
+        if interior:
+            expected_interior = sum(ways * (remaining - k) for k, ways in weights.items())
+            interior_cells = list(hidden - frontier - safe - mines)
+            probabilities[interior_cells] = expected_interior / (total * interior)
+
+        for index, (cells, solutions) in enumerate(components):
+            others = self._convolve(component for i, component in enumerate(components) if i != index)
+            cell_weights = [0] * len(cells)
+            for k, (count, cell_counts) in solutions.items():
+                outside = sum(
+                    ways * comb(interior, remaining - k - other_k)
+                    for other_k, ways in others.items()
+                    if 0 <= remaining - k - other_k <= interior
+                )
+                if outside == 0:
+                    continue
+                for i, mine_count in enumerate(cell_counts):
+                    cell_weights[i] += mine_count * outside
+            for cell, weight in zip(cells, cell_weights):
+                probabilities[cell] = weight / total
+
+        safe_cells = {int(cell) for cell in hidden if probabilities[cell] == 0.0}
+        mine_cells = {int(cell) for cell in hidden if probabilities[cell] == 1.0}
+        return ProbabilityResult(
+            probabilities.reshape(rows, cols), safe_cells, mine_cells,
+            self.nodes, time.perf_counter() - started,
+        )
+
+    def _split_components(self, pending):
+        parent = {}
+
+        def find(cell):
+            while parent[cell] != cell:
+                parent[cell] = parent[parent[cell]]
+                cell = parent[cell]
+            return cell
+
+        for cells in pending:
+            for cell in cells:
+                parent.setdefault(cell, cell)
+            first = find(next(iter(cells)))
+            for cell in cells:
+                root = find(cell)
+                if root != first:
+                    parent[root] = first
+
+        groups = {}
+        for cell in parent:
+            groups.setdefault(find(cell), []).append(cell)
+        return list(groups.values())
+
+    def _solve_component(self, cells, pending, cols):
+        cell_set = set(cells)
+        component_constraints = [(c, count) for c, count in pending.items() if c & cell_set]
+        if self.pattern_cache is None or not self.pattern_cache.accepts(len(cells)):
+            return self._enumerate(component_constraints)
+
+        # Cached results are stored against the canonical cell order of the pattern.
+        key, ordered_cells = canonical_pattern(component_constraints, cols)
+        cached = self.pattern_cache.get(key)
+        if cached is None:
+            order, solutions = self._enumerate(component_constraints)
+            position = {cell: i for i, cell in enumerate(order)}
+            cached = tuple(
+                (k, count, tuple(cell_counts[position[cell]] for cell in ordered_cells))
+                for k, (count, cell_counts) in sorted(solutions.items())
+            )
+            self.pattern_cache.put(key, cached)
+        return ordered_cells, {k: (count, list(cell_counts)) for k, count, cell_counts in cached}
+
+    def _enumerate(self, component_constraints):
+        component_constraints = [(sorted(cells), count) for cells, count in component_constraints]
+
+        # Visit cells constraint by constraint so each constraint closes as early as possible.
+        order = []
+        seen = set()
+        for constraint_cells, _ in sorted(component_constraints, key=lambda item: len(item[0])):
+            for cell in constraint_cells:
+                if cell not in seen:
+                    seen.add(cell)
+                    order.append(cell)
+        position = {cell: i for i, cell in enumerate(order)}
+
+        needed = [count for _, count in component_constraints]
+        unassigned = [len(constraint_cells) for constraint_cells, _ in component_constraints]
+        touching = [[] for _ in order]
+        for index, (constraint_cells, _) in enumerate(component_constraints):
+            for cell in constraint_cells:
+                touching[position[cell]].append(index)
+
+        solutions = {}
+        assignment = [0] * len(order)
+
+        def record(mine_total):
+            entry = solutions.setdefault(mine_total, [0, [0] * len(order)])
+            entry[0] += 1
+            cell_counts = entry[1]
+            for i, value in enumerate(assignment):
+                cell_counts[i] += value
+
+        def search(depth, mine_total):
+            self.nodes += 1
+            if self.nodes > self.max_nodes:
+                raise BudgetExceeded()
+            if self.deadline is not None and self.nodes % 1024 == 0 and time.perf_counter() > self.deadline:
+                raise BudgetExceeded()
+
+            if depth == len(order):
+                record(mine_total)
+                return
+
+            for value in (0, 1):
+                valid = True
+                for index in touching[depth]:
+                    unassigned[index] -= 1
+                    needed[index] -= value
+                    if needed[index] < 0 or needed[index] > unassigned[index]:
+                        valid = False
+                if valid:
+                    assignment[depth] = value
+                    search(depth + 1, mine_total + value)
+                for index in touching[depth]:
+                    unassigned[index] += 1
+                    needed[index] += value
+
+        search(0, 0)
+        return order, {k: (count, cell_counts) for k, (count, cell_counts) in solutions.items()}
+
+    def _convolve(self, components):
+        totals = {0: 1}
+        for _, solutions in components:
+            combined = {}
+            for k, ways in totals.items():
+                for extra, (count, _) in solutions.items():
+                    combined[k + extra] = combined.get(k + extra, 0) + ways * count
+            totals = combined
+        return totals
+
+    def _combine(self, components, interior, remaining):
+        weights = {}
+        for k, ways in self._convolve(components).items():
+            if 0 <= remaining - k <= interior:
+                weights[k] = ways * comb(interior, remaining - k)
+        if not weights or sum(weights.values()) == 0:
+            return None
+        return weights
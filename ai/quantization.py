@@ -0,0 +1,210 @@
+import argparse
+import json
+import numpy as np
+from ai.model_registry import INT8_MODEL_PATH, NUMPY_MODEL_PATH
+from ai.numpy_model import NumpyModel, get_activation, im2col
+
+QUANTIZED_LAYERS = ("Conv2D", "Dense")
+INT8_MAX = 127
+
+# A float32 accumulator holds every integer up to 2**24 exactly, so int8 x int8 dot
+# products of this length or shorter can run through float BLAS with no rounding.
+FLOAT_EXACT_LIMIT = 2 ** 24
+
+
+def quantize_per_channel(kernel):
+    # Symmetric int8 with one scale per output channel (the kernel's last axis).
+    flat = kernel.reshape(-1, kernel.shape[-1])
+    scale = np.abs(flat).max(axis=0) / INT8_MAX
+    scale[scale == 0] = 1.0
+    quantized = np.clip(np.rint(kernel / scale), -INT8_MAX, INT8_MAX).astype(np.int8)
+    return quantized, scale.astype(np.float32)
+
+
+def quantize_tensor(x, scale):
+    return np.clip(np.rint(x / scale), -INT8_MAX, INT8_MAX).astype(np.int8)
+
+
+class _CalibrationModel(NumpyModel):
+    def __init__(self, model):
+        super().__init__(model.layers, model.outputs, model.weights, model.input_shape)
+        self.input_ranges = {}
+
+    def _apply_layer(self, layer, inputs):
+        if layer["class_name"] in QUANTIZED_LAYERS:
+            peak = float(np.abs(inputs[0]).max())
+            self.input_ranges[layer["name"]] = max(self.input_ranges.get(layer["name"], 0.0), peak)
+        return super()._apply_layer(layer, inputs)
+
+
+def calibrate_input_ranges(model, positions, batch_size=256):
+    # Largest absolute input each quantized layer sees on the calibration positions.
+    observer = _CalibrationModel(model)
+    for start in range(0, len(positions), batch_size):
+        observer.forward(positions[start:start + batch_size])
+    return observer.input_ranges
+
+
+class QuantizedNumpyModel(NumpyModel):
+    def __init__(self, layers, outputs, weights, input_shape, quantized, accumulate="auto"):
+        super().__init__(layers, outputs, weights, input_shape)
+        if accumulate not in ("auto", "int32"):
+            raise ValueError("accumulate must be 'auto' or 'int32'")
+        self.quantized = quantized
+        self.accumulate = accumulate
+
+    @classmethod
+    def from_float(cls, model, positions, accumulate="auto"):
+        input_ranges = calibrate_input_ranges(model, positions)
+        weights = dict(model.weights)
+        quantized = {}
+        for layer in model.layers:
+            name = layer["name"]
+            if layer["class_name"] not in QUANTIZED_LAYERS:
+                continue
+            layer_weights = weights.pop(name)
+            kernel, kernel_scale = quantize_per_channel(layer_weights[0])
+            has_bias = layer["config"].get("use_bias", True) and len(layer_weights) > 1
+            quantized[name] = {
+                "kernel": kernel,
+                "kernel_scale": kernel_scale,
+                "input_scale": max(input_ranges.get(name, 0.0), 1e-8) / INT8_MAX,
+                "bias": layer_weights[1].astype(np.float32) if has_bias else None,
+            }
+            weights[name] = []
+        return cls(model.layers, model.outputs, weights, model.input_shape, quantized, accumulate)
+
+    @classmethod
+    def load(cls, path=INT8_MODEL_PATH, accumulate="auto"):
+        with np.load(path, allow_pickle=False) as data:
+            spec = json.loads(str(data["spec"]))
+            weights = {
+                layer["name"]: [data[f"{layer['name']}/{i}"] for i in range(layer["num_weights"])]
+                for layer in spec["layers"]
+            }
+            quantized = {
+                name: {
+                    "kernel": data[f"{name}/kernel_q"],
+                    "kernel_scale": data[f"{name}/kernel_scale"],
+                    "input_scale": input_scale,
+                    "bias": data[f"{name}/bias"] if f"{name}/bias" in data.files else None,
+                }
+                for name, input_scale in spec["input_scales"].items()
+            }
+        return cls(spec["layers"], spec["outputs"], weights, spec["input_shape"], quantized, accumulate)
+
+    def save(self, path=INT8_MODEL_PATH):
+        spec = {
+            "layers": [
+                dict(layer, num_weights=len(self.weights[layer["name"]]))
+                for layer in self.layers
+            ],
+            "outputs": self.outputs,
+            "input_shape": list(self.input_shape),
+            "input_scales": {name: entry["input_scale"] for name, entry in self.quantized.items()},
+        }
+        arrays = {
+            f"{name}/{i}": weight
+            for name, layer_weights in self.weights.items() for i, weight in enumerate(layer_weights)
+        }
+        for name, entry in self.quantized.items():
+            arrays[f"{name}/kernel_q"] = entry["kernel"]
+            arrays[f"{name}/kernel_scale"] = entry["kernel_scale"]
+            if entry["bias"] is not None:
+                arrays[f"{name}/bias"] = entry["bias"]
+        np.savez(path, spec=json.dumps(spec, default=str), **arrays)
+
+    def weight_bytes(self):
+        total = sum(w.nbytes for layer_weights in self.weights.values() for w in layer_weights)
+        for entry in self.quantized.values():
+            total += entry["kernel"].nbytes + entry["kernel_scale"].nbytes
+            total += entry["bias"].nbytes if entry["bias"] is not None else 0
+        return total
+
+    def _apply_layer(self, layer, inputs):
+        entry = self.quantized.get(layer["name"])
+        if entry is None:
+            return super()._apply_layer(layer, inputs)
+
+        config = layer["config"]
+        x = quantize_tensor(inputs[0], entry["input_scale"])
+        kernel = entry["kernel"]
+        filters = kernel.shape[-1]
+        if layer["class_name"] == "Conv2D":
+            columns, grid = im2col(
+                x, kernel.shape[:2], tuple(config.get("strides", (1, 1))),
+                config.get("padding", "valid"), tuple(config.get("dilation_rate", (1, 1))),
+            )
+            out_shape = grid + (filters,)
+        else:
+            columns = x.reshape(-1, kernel.shape[0])
+            out_shape = x.shape[:-1] + (filters,)
+
+        # Integer dot products, then one float rescale per output channel.
+        accumulator = self._int_matmul(columns, kernel.reshape(-1, filters))
+        out = accumulator * (entry["input_scale"] * entry["kernel_scale"])
+        if entry["bias"] is not None:
+            out += entry["bias"]
+        return get_activation(config.get("activation"))(out.reshape(out_shape))
+
+    def _int_matmul(self, columns, kernel):
+        depth = kernel.shape[0]
+        if self.accumulate == "auto" and INT8_MAX * INT8_MAX * depth < FLOAT_EXACT_LIMIT:
+            return columns.astype(np.float32) @ kernel.astype(np.float32)
+        return (columns.astype(np.int32) @ kernel.astype(np.int32)).astype(np.float32)
+
+
+def compare_models(float_model, quantized_model, positions, labels=None):
+    expected = float_model.forward(positions).reshape(len(positions), -1)
+    actual = quantized_model.forward(positions).reshape(len(positions), -1)
+    report = {
+        "max_abs_difference": float(np.abs(expected - actual).max()),
+        "argmax_agreement": float(np.mean(expected.argmax(axis=1) == actual.argmax(axis=1))),
+    }
+    if labels is not None:
+        labels = labels.reshape(len(positions), -1)
+        rows = np.arange(len(positions))
+        report["float_label_hit_rate"] = float(np.mean(labels[rows, expected.argmax(axis=1)] > 0))
+        report["int8_label_hit_rate"] = float(np.mean(labels[rows, actual.argmax(axis=1)] > 0))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quantize the exported NumPy model to int8 and report the cost.")
+    parser.add_argument("--model", default=NUMPY_MODEL_PATH, help="float .npz written by ai.numpy_model")
+    parser.add_argument("--output", default=INT8_MODEL_PATH, help="where to write the int8 .npz")
+    parser.add_argument("--calibration", type=int, default=2000, help="dataset positions used for calibration")
+    parser.add_argument("--evaluate", type=int, default=2000, help="held-out dataset positions used for the report")
+    parser.add_argument("--accumulate", choices=("auto", "int32"), default="auto")
+    args = parser.parse_args(argv)
+
+    from ai.inference import DATASET_PATH, measure_latency
+
+    with np.load(DATASET_PATH) as data:
+        positions, labels = data["X"], data["Y"]
+    calibration = positions[:args.calibration]
+    held_out = slice(len(positions) - args.evaluate, len(positions))
+
+    float_model = NumpyModel.load(args.model)
+    quantized_model = QuantizedNumpyModel.from_float(float_model, calibration, args.accumulate)
+    quantized_model.save(args.output)
+
+    report = compare_models(float_model, quantized_model, positions[held_out], labels[held_out])
+    float_bytes = sum(w.nbytes for layer_weights in float_model.weights.values() for w in layer_weights)
+    report["float_weight_bytes"] = float_bytes
+    report["int8_weight_bytes"] = quantized_model.weight_bytes()
+
+    boards = positions[held_out][:500]
+    float_latency = measure_latency(float_model.predict, boards)
+    int8_latency = measure_latency(quantized_model.predict, boards)
+    report["float_p50_ms"] = float_latency["p50_ms"]
+    report["int8_p50_ms"] = int8_latency["p50_ms"]
+    report["speedup"] = float_latency["p50_ms"] / int8_latency["p50_ms"]
+
+    print(f"Wrote {args.output}")
+    for key, value in report.items():
+        print(f"{key:<22} {value:.4f}" if isinstance(value, float) else f"{key:<22} {value}")
+
+
+if __name__ == "__main__":
+    main()
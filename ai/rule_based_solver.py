@@ -1,46 +1,65 @@
 import numpy as np
+from ai.constraint_engine import ConstraintEngine
+from ai.pattern_table import lookup_moves
+from ai.vectorized_deduction import deduce_masks
+from core.state_encoder import decode_state
 
 
 class RuleBasedSolver:
-    def get_neighbors(self, r, c, max_rows, max_cols):
-        neighbors = []
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0: continue
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < max_rows and 0 <= nc < max_cols:
-                    neighbors.append((nr, nc))
-        return neighbors
+    def __init__(self):
+        self.engine = ConstraintEngine()
+
+    def find_guaranteed_moves(self, board_tensor):
+        return self.engine.find_moves(decode_state(board_tensor))
 
     def find_guaranteed_move(self, board_tensor):
-        rows, cols, _ = board_tensor.shape
-        is_hidden = board_tensor[:, :, 0]
-        is_flagged = board_tensor[:, :, 1]
-
-        number_board = np.zeros((rows, cols), dtype=int)
-        for i in range(1, 9):
-            number_board[board_tensor[:, :, i + 2] == 1] = i
-
-        for r in range(rows):
-            for c in range(cols):
-                if number_board[r, c] > 0 and is_hidden[r, c] == 0:
-                    neighbors = self.get_neighbors(r, c, rows, cols)
-                    flagged_neighbors_count = sum(1 for n in neighbors if is_flagged[n] == 1)
-                    if flagged_neighbors_count == number_board[r, c]:
-                        hidden_neighbors = [n for n in neighbors if is_hidden[n] == 1 and is_flagged[n] == 0]
-                        if hidden_neighbors:
-                            safe_r, safe_c = hidden_neighbors[0]
-                            return safe_r, safe_c, 0
-
-        for r in range(rows):
-            for c in range(cols):
-                if number_board[r, c] > 0 and is_hidden[r, c] == 0:
-                    neighbors = self.get_neighbors(r, c, rows, cols)
-                    flagged_neighbors_count = sum(1 for n in neighbors if is_flagged[n] == 1)
-                    hidden_neighbors = [n for n in neighbors if is_hidden[n] == 1 and is_flagged[n] == 0]
-                    if len(hidden_neighbors) > 0 and len(hidden_neighbors) == number_board[
-                        r, c] - flagged_neighbors_count:
-                        bomb_r, bomb_c = hidden_neighbors[0]
-                        return bomb_r, bomb_c, 1
-
-        return None
\ No newline at end of file
+        visible_board = decode_state(board_tensor)
+        for find in (self.find_mask_move, self.find_table_move, self.find_constraint_move):
+            move = find(visible_board)
+            if move is not None:
+                return move
+        return None
+
+    def find_mask_move(self, visible_board):
+        # The whole-board mask pass settles most positions without building constraints.
+        safe, mines = deduce_masks(visible_board)
+        for mask, action_type in ((safe, 0), (mines, 1)):
+            cells = np.argwhere(mask)
+            if len(cells):
+                return int(cells[0][0]), int(cells[0][1]), action_type
+        return None
+
+    def find_table_move(self, visible_board):
+        table_moves = lookup_moves(visible_board)
+        if len(table_moves):
+            row, col, action_type = table_moves[0][:3]
+            return int(row), int(col), int(action_type)
+        return None
+
+    def find_constraint_move(self, visible_board):
+        moves = self.engine.find_moves(visible_board)
+        return moves[0] if moves else None
+
+    def find_guaranteed_moves_batch(self, board_tensors, use_table=True):
+        # One mask pass over the whole N x rows x cols x 12 stack; returns a list with an
+        # (k, 3) array of (row, col, action_type) per board, safe moves first.
+        visible_boards = decode_state(np.asarray(board_tensors))
+        safe, mines = deduce_masks(visible_boards)
+        num_boards = len(visible_boards)
+
+        found = [np.argwhere(safe), np.argwhere(mines)]
+        moves = np.concatenate([
+            np.column_stack([cells, np.full(len(cells), action_type)])
+            for action_type, cells in enumerate(found)
+        ])
+        order = np.lexsort((moves[:, 3], moves[:, 0]))
+        moves = moves[order]
+        bounds = np.searchsorted(moves[:, 0], np.arange(num_boards + 1))
+        per_board = [moves[bounds[i]:bounds[i + 1], 1:] for i in range(num_boards)]
+
+        # Boards the mask pass cannot move on get the pattern table, one lookup each.
+        if use_table:
+            for i in range(num_boards):
+                if len(per_board[i]) == 0:
+                    per_board[i] = lookup_moves(visible_boards[i])[:, :3]
+        return per_board
@@ -0,0 +1,108 @@
+from collections import deque
+import numpy as np
+from ai.constraint_engine import ConstraintEngine
+
+
+class SolverSession:
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.engine = ConstraintEngine()
+        self.reset()
+
+    def reset(self):
+        self.visible_board = None
+        self.constraints = {}
+        self.sources_by_cell = {}
+        self.ready = deque()
+        self.queued = set()
+
+    def update(self, visible_board, changed_cells=None):
+        board = np.asarray(visible_board, dtype=np.int8)
+
+        if self.visible_board is None:
+            changed = np.argwhere(board >= 0)
+        elif changed_cells is None:
+            changed = np.argwhere(board != self.visible_board)
+        else:
+            changed = np.asarray(changed_cells).reshape(-1, 2)
+        self.visible_board = board.copy()
+
+        # A move only touches the constraints of numbers in or next to the cells it changed.
+        dirty = set()
+        for r, c in changed:
+            for nr, nc in self._neighborhood(r, c):
+                if board[nr, nc] >= 0:
+                    dirty.add(nr * self.cols + nc)
+
+        for source in dirty:
+            self._rebuild_constraint(source)
+
+        worklist = self._connected_sources(dirty)
+        if not worklist:
+            return
+
+        safe, mines, _ = self.engine.propagate(self.constraints[source] for source in worklist)
+        for cells, action_type in ((safe, 0), (mines, 1)):
+            for cell in sorted(cells):
+                if (cell, action_type) not in self.queued:
+                    self.queued.add((cell, action_type))
+                    self.ready.append((cell, action_type))
+
+    def pop_move(self):
+        while self.ready:
+            cell, action_type = self.ready.popleft()
+            self.queued.discard((cell, action_type))
+            row, col = divmod(cell, self.cols)
+            if self.visible_board is not None and self.visible_board[row, col] == -2:
+                return row, col, action_type
+        return None
+
+    def pending_moves(self):
+        return len(self.ready)
+
+    def _neighborhood(self, row, col):
+        for nr in range(max(0, row - 1), min(self.rows, row + 2)):
+            for nc in range(max(0, col - 1), min(self.cols, col + 2)):
+                yield nr, nc
+
+    def _rebuild_constraint(self, source):
+        old = self.constraints.pop(source, None)
+        if old is not None:
+            for cell in old[0]:
+                sources = self.sources_by_cell.get(cell)
+                if sources is not None:
+                    sources.discard(source)
+                    if not sources:
+                        del self.sources_by_cell[cell]
+
+        row, col = divmod(source, self.cols)
+        hidden = []
+        flagged = 0
+        for nr, nc in self._neighborhood(row, col):
+            value = self.visible_board[nr, nc]
+            if value == -2:
+                hidden.append(nr * self.cols + nc)
+            elif value == -3:
+                flagged += 1
+        if not hidden:
+            return
+
+        cells = frozenset(hidden)
+        self.constraints[source] = (cells, int(self.visible_board[row, col]) - flagged)
+        for cell in cells:
+            self.sources_by_cell.setdefault(cell, set()).add(source)
+
+    def _connected_sources(self, dirty):
+        # Pull in every constraint that shares a cell with a dirty one, transitively,
+        # so subset reduction sees the whole affected frontier component.
+        stack = [source for source in dirty if source in self.constraints]
+        seen = set(stack)
+        while stack:
+            source = stack.pop()
+            for cell in self.constraints[source][0]:
+                for other in self.sources_by_cell.get(cell, ()):
+                    if other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+        return seen
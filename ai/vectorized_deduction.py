@@ -0,0 +1,19 @@
+import numpy as np
+from core.board_generator import count_neighbors
+
+
+def deduce_masks(visible_boards):
+    # Works on one rows x cols board or on a stack of N boards with the same code.
+    boards = np.asarray(visible_boards)
+    hidden = boards == -2
+    numbers = boards >= 0
+
+    hidden_neighbors = count_neighbors(hidden)
+    remaining = boards - count_neighbors(boards == -3)
+
+    satisfied = numbers & (remaining == 0) & (hidden_neighbors > 0)
+    saturated = numbers & (remaining > 0) & (remaining == hidden_neighbors)
+
+    safe = hidden & (count_neighbors(satisfied) > 0)
+    mines = hidden & (count_neighbors(saturated) > 0)
+    return safe, mines
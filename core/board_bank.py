@@ -0,0 +1,73 @@
+import json
+import os
+import numpy as np
+from core.board_generator import sample_mines_batch
+
+
+class BoardBank:
+    def __init__(self, path):
+        self.path = path
+        with open(self.metadata_path(path), 'r') as f:
+            metadata = json.load(f)
+
+        self.rows = metadata['rows']
+        self.cols = metadata['cols']
+        self.bombs = metadata['bombs']
+        self.seed = metadata.get('seed')
+        self.boards = np.load(path, mmap_mode='r')
+
+    @staticmethod
+    def metadata_path(path):
+        return os.path.splitext(path)[0] + '.json'
+
+    @staticmethod
+    def board_dtype(rows, cols):
+        return np.dtype([
+            ('start', np.int32),
+            ('mines', np.uint8, ((rows * cols + 7) // 8,)),
+        ])
+
+    @classmethod
+    def create(cls, path, count, rows=9, cols=9, bombs=10, seed=None, chunk_size=65536):
+        rng = np.random.default_rng(seed)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        boards = np.lib.format.open_memmap(path, mode='w+', dtype=cls.board_dtype(rows, cols), shape=(count,))
+        for begin in range(0, count, chunk_size):
+            end = min(begin + chunk_size, count)
+            starts = rng.integers(0, rows * cols, size=end - begin)
+            mines = sample_mines_batch(end - begin, rows, cols, bombs, starts, rng)
+            boards['start'][begin:end] = starts
+            boards['mines'][begin:end] = np.packbits(mines.reshape(end - begin, -1), axis=1)
+        boards.flush()
+        del boards
+
+        with open(cls.metadata_path(path), 'w') as f:
+            json.dump({'rows': rows, 'cols': cols, 'bombs': bombs, 'count': count, 'seed': seed}, f, indent=4)
+
+        return cls(path)
+
+    def check_layout(self, rows, cols, bombs):
+        if (self.rows, self.cols, self.bombs) != (rows, cols, bombs):
+            raise ValueError(
+                f"Board bank holds {self.rows}x{self.cols} boards with {self.bombs} bombs, "
+                f"expected {rows}x{cols} with {bombs}."
+            )
+
+    def __len__(self):
+        return len(self.boards)
+
+    def get(self, index):
+        record = self.boards[index % len(self.boards)]
+        cells = self.rows * self.cols
+        mines = np.unpackbits(record['mines'], count=cells).astype(bool).reshape(self.rows, self.cols)
+        start_row, start_col = divmod(int(record['start']), self.cols)
+        return mines, start_row, start_col
+
+    def get_batch(self, indices):
+        records = self.boards[np.asarray(indices) % len(self.boards)]
+        cells = self.rows * self.cols
+        mines = np.unpackbits(records['mines'], axis=1, count=cells).astype(bool)
+        return mines.reshape(len(records), self.rows, self.cols), records['start'].astype(np.int64)
@@ -0,0 +1,53 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def count_neighbors(mask):
+    # Works on a single rows x cols mask or on any stack of them.
+    pad = [(0, 0)] * (mask.ndim - 2) + [(1, 1), (1, 1)]
+    padded = np.pad(mask, pad).astype(np.int8)
+    windows = sliding_window_view(padded, (3, 3), axis=(-2, -1))
+    return windows.sum(axis=(-2, -1), dtype=np.int8) - mask
+
+
+def sample_mines(rows, cols, bombs, safe_row, safe_col, rng=None):
+    if rng is None:
+        rng = np.random.default_rng()
+
+    cells = rows * cols
+    if not 0 <= bombs < cells:
+        raise ValueError(f"Cannot place {bombs} bombs on a {rows}x{cols} board with a safe start cell.")
+
+    # Sample from every cell but the safe one, then shift indices past it back into place.
+    safe_flat = safe_row * cols + safe_col
+    bomb_flat = rng.choice(cells - 1, size=bombs, replace=False)
+    bomb_flat[bomb_flat >= safe_flat] += 1
+
+    mines = np.zeros(cells, dtype=bool)
+    mines[bomb_flat] = True
+    return mines.reshape(rows, cols)
+
+
+def sample_mines_batch(count, rows, cols, bombs, safe_flat, rng=None):
+    if rng is None:
+        rng = np.random.default_rng()
+
+    cells = rows * cols
+    mines = np.zeros((count, cells), dtype=bool)
+    if bombs > 0:
+        # The smallest random keys win; the safe cell's key can never be among them.
+        keys = rng.random((count, cells))
+        keys[np.arange(count), safe_flat] = np.inf
+        bomb_flat = np.argpartition(keys, bombs - 1, axis=1)[:, :bombs]
+        mines[np.arange(count)[:, None], bomb_flat] = True
+    return mines.reshape(count, rows, cols)
+
+
+def solution_from_mines(mines):
+    board = count_neighbors(mines).astype(np.int8)
+    board[mines] = -1
+    return board
+
+
+def generate_board(rows, cols, bombs, safe_row, safe_col, rng=None):
+    return solution_from_mines(sample_mines(rows, cols, bombs, safe_row, safe_col, rng))
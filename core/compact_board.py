@@ -0,0 +1,54 @@
+import numpy as np
+from core.board_generator import solution_from_mines
+
+
+BOARD_DTYPE = np.int8
+
+MINE_PLANE = 0
+REVEALED_PLANE = 1
+FLAG_PLANE = 2
+NUM_PLANES = 3
+
+
+def to_compact_state(board):
+    return np.asarray(board).astype(BOARD_DTYPE, copy=False)
+
+
+def packed_size(rows, cols):
+    return (rows * cols + 7) // 8
+
+
+def pack_board(solution_board, visible_board):
+    # Works on one rows x cols board or on a stack of them; the planes are
+    # packed over the flattened board, so each board costs 3 bits per cell.
+    solution_board = np.asarray(solution_board)
+    visible_board = np.asarray(visible_board)
+    batch_shape = solution_board.shape[:-2]
+    cells = solution_board.shape[-2] * solution_board.shape[-1]
+
+    planes = np.empty(batch_shape + (NUM_PLANES, cells), dtype=bool)
+    planes[..., MINE_PLANE, :] = (solution_board == -1).reshape(batch_shape + (cells,))
+    planes[..., REVEALED_PLANE, :] = (visible_board >= -1).reshape(batch_shape + (cells,))
+    planes[..., FLAG_PLANE, :] = (visible_board == -3).reshape(batch_shape + (cells,))
+    return np.packbits(planes, axis=-1)
+
+
+def unpack_board(packed, rows, cols):
+    packed = np.asarray(packed)
+    batch_shape = packed.shape[:-2]
+    planes = np.unpackbits(packed, axis=-1, count=rows * cols).astype(bool)
+    planes = planes.reshape(batch_shape + (NUM_PLANES, rows, cols))
+
+    mines = planes[..., MINE_PLANE, :, :]
+    revealed = planes[..., REVEALED_PLANE, :, :]
+    flagged = planes[..., FLAG_PLANE, :, :]
+
+    solution_board = solution_from_mines(mines)
+    visible_board = np.full(solution_board.shape, -2, dtype=BOARD_DTYPE)
+    visible_board[flagged] = -3
+    visible_board[revealed] = solution_board[revealed]
+    return solution_board, visible_board
+
+
+def unpack_state(packed, rows, cols):
+    return unpack_board(packed, rows, cols)[1]
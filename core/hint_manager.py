@@ -1,11 +1,14 @@
 from PyQt6.QtCore import QTimer, QPropertyAnimation, QPoint, Qt
 from PyQt6.QtGui import QPainter, QPixmap, QColor, QPolygon
 from PyQt6.QtWidgets import QGraphicsOpacityEffect, QLabel, QGraphicsDropShadowEffect
+from ai.endgame_solver import EndgameSolver
+from ai.pattern_table import lookup_moves
 
 class HintManager:
     def __init__(self, parent_window, sound_manager):
         self.parent = parent_window
         self.sound_manager = sound_manager
+        self.endgame_solver = EndgameSolver()
 
         self.default_tile_style = ""
         self.safe_hint_style = ""
@@ -135,7 +138,8 @@ def show_hint(self):
         self.sound_manager.play("hint")
 
         self.show_hint_popup(hint_tile, reason)
-        self.highlight_source_tile(src_r, src_c)
+        if src_r is not None:
+            self.highlight_source_tile(src_r, src_c)
 
         self.hints_used += 1
 
@@ -184,8 +188,37 @@ def find_best_hint(self):
                 if bombs_remaining > 0 and bombs_remaining == len(unrevealed):
                     return unrevealed[0], "flag", "Remaining unrevealed tiles must be bombs.", r, c
 
+        table_moves = lookup_moves(self.parent.get_visible_board_state())
+        if len(table_moves):
+            row, col, action_type, src_r, src_c = (int(value) for value in table_moves[0])
+            if action_type == 0:
+                return self.buttons[row][col], "safe", "Comparing neighbouring numbers shows this tile is safe.", src_r, src_c
+            return self.buttons[row][col], "flag", "Comparing neighbouring numbers shows this tile is a bomb.", src_r, src_c
+
+        visible_board = self.parent.get_visible_board_state()
+        result = self.endgame_solver.solve(visible_board, self.parent.num_bombs)
+        if result is not None:
+            for cells, hint_type, reason in (
+                (result.safe, "safe", "Counting the bombs left shows this tile is safe."),
+                (result.mines, "flag", "Counting the bombs left shows this tile is a bomb."),
+            ):
+                for cell in sorted(cells):
+                    row, col = divmod(cell, self.grid_size)
+                    if visible_board[row][col] == -2:
+                        src_r, src_c = self.find_source_tile(row, col)
+                        return self.buttons[row][col], hint_type, reason, src_r, src_c
+
         return None, None, None, None, None
 
+    def find_source_tile(self, row, col):
+        # Tiles deduced from the bomb count may have no numbered neighbour to point at.
+        for r in range(max(0, row - 1), min(self.grid_size, row + 2)):
+            for c in range(max(0, col - 1), min(self.grid_size, col + 2)):
+                tile = self.buttons[r][c]
+                if tile.is_revealed and tile.adjacent_bombs > 0:
+                    return r, c
+        return None, None
+
     def get_neighbors(self, row, col):
         neighbors = []
         for dr in [-1, 0, 1]:
@@ -1,40 +1,127 @@
+import copy
 import numpy as np
-import random
+from core.board_generator import generate_board, solution_from_mines
+from core.compact_board import BOARD_DTYPE
+from core.state_encoder import StateEncoder, encode_action_mask
+from core.zero_regions import label_zero_regions, build_reveal_regions
+
+
+class GameOverError(Exception):
+    pass
 
 
 class MinesweeperEnv:
-    def __init__(self, rows=9, cols=9, bombs=10):
+    def __init__(self, rows=9, cols=9, bombs=10, reuse_state_buffer=False, seed=None,
+                 board_bank=None, bank_offset=0, bank_stride=1, track_undo=False):
         self.rows = rows
         self.cols = cols
         self.bombs = bombs
         self.action_space_size = rows * cols * 2
+        self.reuse_state_buffer = reuse_state_buffer
+        self.state_encoder = StateEncoder(rows, cols)
+        self.rng = np.random.default_rng(seed)
+
+        if board_bank is not None:
+            board_bank.check_layout(rows, cols, bombs)
+        self.board_bank = board_bank
+        self.bank_cursor = bank_offset
+        self.bank_stride = bank_stride
+
+        # Each undo frame holds the counters before a step plus where its cell changes start.
+        self.track_undo = track_undo
+        self.undo_frames = []
+        self.undo_cells = []
 
-    def reset(self):
-        self.solution_board = np.zeros((self.rows, self.cols), dtype=int)
-        self.visible_board = np.full((self.rows, self.cols), -2, dtype=int)
+    def reset(self, seed=None, board_index=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+
+        self.visible_board = np.full((self.rows, self.cols), -2, dtype=BOARD_DTYPE)
         self.game_over = False
         self.win = False
+        self.state_encoder.reset()
+
+        # Kept up to date by every reveal and flag so reward and win checks never scan the board.
+        self.revealed_safe = 0
+        self.flags_placed = 0
+        self.hidden_cells = self.rows * self.cols
+        self.safe_cells = self.rows * self.cols - self.bombs
+        self.undo_frames.clear()
+        self.undo_cells.clear()
+        self.action_mask = None
 
-        start_row, start_col = random.randint(0, self.rows - 1), random.randint(0, self.cols - 1)
-        self._place_bombs(start_row, start_col)
+        if self.board_bank is not None:
+            if board_index is None:
+                board_index = self.bank_cursor
+                self.bank_cursor += self.bank_stride
+            mines, start_row, start_col = self.board_bank.get(board_index)
+            self._set_solution_board(solution_from_mines(mines))
+        else:
+            start_row, start_col = self.rng.integers(self.rows), self.rng.integers(self.cols)
+            self._place_bombs(start_row, start_col)
         self._reveal_tile(start_row, start_col)
 
         return self._get_state_tensor()
 
     def step(self, action):
         if self.game_over:
-            raise Exception("Cannot take action on a finished game. Please reset the environment.")
+            raise GameOverError("Cannot take action on a finished game. Please reset the environment.")
+
+        row, col, action_type = self._decode_action(action)
+        self._push_undo_frame()
+
+        if not self._apply_action(row, col, action_type):
+            return self._get_state_tensor(), -5, False, {"action_mask": self.get_action_mask()}
+
+        reward = self._update_outcome()
+        return self._get_state_tensor(), reward, self.game_over, {"action_mask": self.get_action_mask()}
+
+    def step_many(self, actions):
+        if self.game_over:
+            raise GameOverError("Cannot take action on a finished game. Please reset the environment.")
+
+        self._push_undo_frame()
+
+        applied = 0
+        invalid = 0
+        for action in actions:
+            row, col, action_type = self._decode_action(action)
+            applied += 1
+            if not self._apply_action(row, col, action_type):
+                invalid += 1
+                continue
+            if self.game_over or self._check_win():
+                break
+
+        reward = self._update_outcome()
+        info = {"action_mask": self.get_action_mask(), "applied": applied, "invalid": invalid}
+        return self._get_state_tensor(), reward, self.game_over, info
+
+    def get_action_mask(self):
+        # Built once per observation and reused until the next move changes the board.
+        if self.action_mask is None:
+            self.action_mask = encode_action_mask(self.visible_board)
+        return self.action_mask
 
-        row, col, action_type = np.unravel_index(action, (self.rows, self.cols, 2))
+    def _decode_action(self, action):
+        # Accepts a flat index into (rows, cols, 2) or a (row, col, action_type) tuple.
+        if isinstance(action, tuple):
+            return int(action[0]), int(action[1]), int(action[2])
+        cell, action_type = divmod(int(action), 2)
+        row, col = divmod(cell, self.cols)
+        return row, col, action_type
 
+    def _apply_action(self, row, col, action_type):
         if action_type == 0:
             if self.visible_board[row, col] >= 0:
-                return self._get_state_tensor(), -5, False, {}
+                return False
             self._reveal_tile(row, col)
-
         elif action_type == 1:
             self._toggle_flag(row, col)
+        self.action_mask = None
+        return True
 
+    def _update_outcome(self):
         reward = self._get_reward()
         self.win = self._check_win()
         if self.win:
@@ -44,39 +131,81 @@ def step(self, action):
         if self.game_over and not self.win:
             reward = -100
 
-        return self._get_state_tensor(), reward, self.game_over, {}
+        return reward
+
+    def _push_undo_frame(self):
+        if self.track_undo:
+            self.undo_frames.append((
+                self.revealed_safe, self.flags_placed, self.hidden_cells,
+                self.game_over, self.win, len(self.undo_cells),
+            ))
+
+    def undo(self):
+        if not self.undo_frames:
+            raise ValueError("Nothing to undo. Create the environment with track_undo=True to record steps.")
+
+        (self.revealed_safe, self.flags_placed, self.hidden_cells,
+         self.game_over, self.win, cell_mark) = self.undo_frames.pop()
+
+        visible = self.visible_board.reshape(-1)
+        while len(self.undo_cells) > cell_mark:
+            cells, old_value = self.undo_cells.pop()
+            visible[cells] = old_value
+        self.action_mask = None
+
+    def snapshot(self):
+        return {
+            "visible_board": self.visible_board.copy(),
+            "game_over": self.game_over,
+            "win": self.win,
+            "revealed_safe": self.revealed_safe,
+            "flags_placed": self.flags_placed,
+            "hidden_cells": self.hidden_cells,
+        }
+
+    def restore(self, snapshot):
+        self.visible_board[...] = snapshot["visible_board"]
+        self.game_over = snapshot["game_over"]
+        self.win = snapshot["win"]
+        self.revealed_safe = snapshot["revealed_safe"]
+        self.flags_placed = snapshot["flags_placed"]
+        self.hidden_cells = snapshot["hidden_cells"]
+        self.undo_frames.clear()
+        self.undo_cells.clear()
+        self.action_mask = None
+
+    def clone(self):
+        # The solution board and its zero regions never change after reset, so the
+        # clone shares them and only copies the state a move can touch.
+        other = copy.copy(self)
+        other.visible_board = self.visible_board.copy()
+        other.state_encoder = StateEncoder(self.rows, self.cols)
+        other.rng = copy.deepcopy(self.rng)
+        other.undo_frames = []
+        other.undo_cells = []
+        return other
 
     def _get_reward(self):
         if self.game_over and not self.win:
             return -100
 
-        return np.sum((self.visible_board >= 0) & (self.solution_board != -1))
+        return self.revealed_safe
 
     def _place_bombs(self, safe_row, safe_col):
-        positions = [(r, c) for r in range(self.rows) for c in range(self.cols)]
-        positions.remove((safe_row, safe_col))
-        bomb_positions = random.sample(positions, self.bombs)
-
-        for r, c in bomb_positions:
-            self.solution_board[r, c] = -1
-
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.solution_board[r, c] != -1:
-                    self.solution_board[r, c] = self._count_adjacent_bombs(r, c)
-
-    def _count_adjacent_bombs(self, row, col):
-        count = 0
-        for r in range(max(0, row - 1), min(self.rows, row + 2)):
-            for c in range(max(0, col - 1), min(self.cols, col + 2)):
-                if self.solution_board[r, c] == -1:
-                    count += 1
-        return count
+        self._set_solution_board(generate_board(self.rows, self.cols, self.bombs, safe_row, safe_col, self.rng))
+
+    def _set_solution_board(self, solution_board):
+        self.solution_board = solution_board
+        self.zero_labels = label_zero_regions(self.solution_board)
+        self.reveal_regions = build_reveal_regions(self.zero_labels)
 
     def _reveal_tile(self, row, col):
         if self.visible_board[row, col] != -2:
             return
 
+        self.hidden_cells -= 1
+        if self.track_undo:
+            self.undo_cells.append((row * self.cols + col, -2))
         if self.solution_board[row, col] == -1:
             self.game_over = True
             self.visible_board[row, col] = -1
@@ -84,36 +213,64 @@ def _reveal_tile(self, row, col):
 
         value = self.solution_board[row, col]
         self.visible_board[row, col] = value
+        self.revealed_safe += 1
 
         if value == 0:
             self._flood_fill(row, col)
 
     def _toggle_flag(self, row, col):
+        if self.track_undo and self.visible_board[row, col] in (-2, -3):
+            self.undo_cells.append((row * self.cols + col, self.visible_board[row, col]))
+
         if self.visible_board[row, col] == -2:
             self.visible_board[row, col] = -3
+            self.flags_placed += 1
+            self.hidden_cells -= 1
         elif self.visible_board[row, col] == -3:
             self.visible_board[row, col] = -2
+            self.flags_placed -= 1
+            self.hidden_cells += 1
 
     def _flood_fill(self, row, col):
-        for r in range(max(0, row - 1), min(self.rows, row + 2)):
-            for c in range(max(0, col - 1), min(self.cols, col + 2)):
-                if self.visible_board[r, c] == -2:
-                    self._reveal_tile(r, c)
+        cells = self.reveal_regions[self.zero_labels[row, col] - 1]
+        visible = self.visible_board.reshape(-1)
+        current = visible[cells]
+
+        # A flag inside the region can cut it off, so walk it cell by cell instead.
+        if np.any(current == -3):
+            self._stack_flood_fill(row, col)
+            return
+
+        hidden_cells = cells[current == -2]
+        visible[hidden_cells] = self.solution_board.reshape(-1)[hidden_cells]
+        self.revealed_safe += len(hidden_cells)
+        self.hidden_cells -= len(hidden_cells)
+        if self.track_undo:
+            self.undo_cells.append((hidden_cells, -2))
+
+    def _stack_flood_fill(self, row, col):
+        stack = [(row, col)]
+        while stack:
+            r, c = stack.pop()
+            for nr in range(max(0, r - 1), min(self.rows, r + 2)):
+                for nc in range(max(0, c - 1), min(self.cols, c + 2)):
+                    if self.visible_board[nr, nc] != -2:
+                        continue
+                    value = self.solution_board[nr, nc]
+                    self.visible_board[nr, nc] = value
+                    self.revealed_safe += 1
+                    self.hidden_cells -= 1
+                    if self.track_undo:
+                        self.undo_cells.append((nr * self.cols + nc, -2))
+                    if value == 0:
+                        stack.append((nr, nc))
 
     def _check_win(self):
-        return np.all((self.visible_board >= 0) | (self.solution_board == -1))
+        return self.revealed_safe == self.safe_cells
 
     def _get_state_tensor(self):
-        tensor = np.zeros((self.rows, self.cols, 12), dtype=np.float32)
-        for r in range(self.rows):
-            for c in range(self.cols):
-                val = self.visible_board[r, c]
-                if val == -2:
-                    tensor[r, c, 0] = 1
-                elif val == -3:
-                    tensor[r, c, 1] = 1
-                elif val == 0:
-                    tensor[r, c, 2] = 1
-                elif val > 0 and val <= 8:
-                    tensor[r, c, int(val) + 2] = 1
-        return tensor
\ No newline at end of file
+        # The encoder only rewrites cells that changed since the previous call.
+        tensor = self.state_encoder.encode(self.visible_board)
+        if self.reuse_state_buffer:
+            return tensor
+        return tensor.copy()
@@ -0,0 +1,171 @@
+import multiprocessing as mp
+import os
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from core.compact_board import BOARD_DTYPE
+from core.minesweeper_env import MinesweeperEnv
+
+
+# Policy factories are called in each worker with the board settings of the rollout.
+def rule_based_policy(rows, cols, bombs):
+    from ai.rule_based_solver import RuleBasedSolver
+    return RuleBasedSolver().find_guaranteed_move
+
+
+def ai_agent_policy(rows, cols, bombs):
+    from ai.ai_agent import AIAgent
+    return AIAgent(total_mines=bombs).predict_move
+
+
+class RolloutBuffers:
+    def __init__(self, num_games, max_steps, rows, cols, names=None):
+        self.specs = {
+            "boards": ((num_games, max_steps + 1, rows, cols), BOARD_DTYPE),
+            "actions": ((num_games, max_steps), np.int32),
+            "rewards": ((num_games, max_steps), np.float32),
+            "lengths": ((num_games,), np.int32),
+            "wins": ((num_games,), np.bool_),
+        }
+        self.owner = names is None
+        self.memory = {}
+        self.arrays = {}
+        for key, (shape, dtype) in self.specs.items():
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            if self.owner:
+                block = shared_memory.SharedMemory(create=True, size=size)
+            else:
+                block = shared_memory.SharedMemory(name=names[key])
+            self.memory[key] = block
+            self.arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+            if self.owner:
+                self.arrays[key].fill(0)
+
+    def names(self):
+        return {key: block.name for key, block in self.memory.items()}
+
+    def copy_arrays(self):
+        return {key: array.copy() for key, array in self.arrays.items()}
+
+    def close(self):
+        self.arrays.clear()
+        for block in self.memory.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+        self.memory.clear()
+
+
+class RolloutResult:
+    def __init__(self, arrays, elapsed):
+        self.boards = arrays["boards"]
+        self.actions = arrays["actions"]
+        self.rewards = arrays["rewards"]
+        self.lengths = arrays["lengths"]
+        self.wins = arrays["wins"]
+        self.elapsed = elapsed
+
+    @property
+    def num_games(self):
+        return len(self.lengths)
+
+    @property
+    def win_rate(self):
+        return float(np.mean(self.wins)) if self.num_games else 0.0
+
+    @property
+    def games_per_second(self):
+        return self.num_games / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def summary(self):
+        return {
+            "games": self.num_games,
+            "win_rate": self.win_rate,
+            "mean_length": float(np.mean(self.lengths)) if self.num_games else 0.0,
+            "elapsed": self.elapsed,
+            "games_per_second": self.games_per_second,
+        }
+
+
+def _encode_action(action, cols):
+    if action is None:
+        return None
+    if isinstance(action, tuple):
+        row, col, action_type = (int(value) for value in action)
+        return (row * cols + col) * 2 + action_type
+    return int(action)
+
+
+def _play_games(names, num_games, first_game, last_game, config, policy_factory, seed):
+    rows, cols, bombs, max_steps = config
+    buffers = RolloutBuffers(num_games, max_steps, rows, cols, names=names)
+    arrays = buffers.arrays
+
+    env = MinesweeperEnv(rows, cols, bombs, seed=seed)
+    policy = policy_factory(rows, cols, bombs)
+    rng = np.random.default_rng(seed)
+
+    for game in range(first_game, last_game):
+        state = env.reset()
+        arrays["boards"][game, 0] = env.visible_board
+        steps = 0
+
+        while not env.game_over and steps < max_steps:
+            mask = env.get_action_mask()
+            action = _encode_action(policy(state), cols)
+
+            # Fall back to a random reveal when the policy has no answer or repeats an illegal move,
+            # or to any legal action (an unflag) once every hidden cell is flagged.
+            if action is None or not 0 <= action < env.action_space_size or not mask[action]:
+                reveals = np.flatnonzero(mask[0::2])
+                if len(reveals):
+                    action = int(rng.choice(reveals)) * 2
+                else:
+                    legal = np.flatnonzero(mask)
+                    if len(legal) == 0:
+                        break
+                    action = int(rng.choice(legal))
+
+            state, reward, done, _ = env.step(action)
+            arrays["actions"][game, steps] = action
+            arrays["rewards"][game, steps] = reward
+            steps += 1
+            arrays["boards"][game, steps] = env.visible_board
+
+        arrays["lengths"][game] = steps
+        arrays["wins"][game] = env.win
+
+    buffers.close()
+    return last_game - first_game
+
+
+def run_rollouts(policy_factory, num_games, rows=9, cols=9, bombs=10, max_steps=None,
+                 num_workers=None, seed=None, start_method=None):
+    if max_steps is None:
+        max_steps = rows * cols
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = max(1, min(num_workers, num_games))
+
+    base_seed = np.random.SeedSequence(seed)
+    worker_seeds = [int(child.generate_state(1)[0]) for child in base_seed.spawn(num_workers)]
+    bounds = np.linspace(0, num_games, num_workers + 1).astype(int)
+    config = (rows, cols, bombs, max_steps)
+
+    buffers = RolloutBuffers(num_games, max_steps, rows, cols)
+    try:
+        started = time.perf_counter()
+        jobs = [
+            (buffers.names(), num_games, int(bounds[i]), int(bounds[i + 1]), config, policy_factory, worker_seeds[i])
+            for i in range(num_workers)
+        ]
+        if num_workers == 1:
+            _play_games(*jobs[0])
+        else:
+            context = mp.get_context(start_method)
+            with context.Pool(num_workers) as pool:
+                pool.starmap(_play_games, jobs)
+        elapsed = time.perf_counter() - started
+        return RolloutResult(buffers.copy_arrays(), elapsed)
+    finally:
+        buffers.close()
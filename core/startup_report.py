@@ -0,0 +1,85 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports the home page needs, in the order main.py pulls them in. Each phase is timed
+# on top of the ones before it, so its number is what that phase adds.
+STARTUP_PHASES = [
+    ("numpy", "import numpy"),
+    ("pyqt", "import PyQt6.QtWidgets, PyQt6.QtGui, PyQt6.QtCore"),
+    ("core", "import core.settingsManager, core.soundManager, core.minesweeper_env"),
+    ("game_ui", "import game_ui"),
+    ("game_manual", "import game_manual"),
+    ("game_ai", "import game_ai"),
+    ("main", "import main"),
+    # What HomePage schedules once the window is up; it must not pull in TensorFlow.
+    ("preload", "from ai import model_registry\nthread = model_registry.preload()\nif thread is not None: thread.join()"),
+]
+TENSORFLOW_PHASE = ("tensorflow", "import tensorflow")
+
+_CHILD_SCRIPT = """
+import json, sys, time
+phases = json.loads(sys.argv[1])
+report = []
+started = time.perf_counter()
+for name, statement in phases:
+    phase_started = time.perf_counter()
+    entry = {"phase": name}
+    try:
+        exec(statement, {})
+    except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+    entry["seconds"] = time.perf_counter() - phase_started
+    entry["tensorflow_loaded"] = "tensorflow" in sys.modules
+    report.append(entry)
+print(json.dumps({"phases": report, "total_seconds": time.perf_counter() - started}))
+"""
+
+
+def measure_startup(include_tensorflow=False):
+    # A fresh interpreter per report so nothing is already cached in sys.modules.
+    phases = list(STARTUP_PHASES)
+    if include_tensorflow:
+        phases.append(TENSORFLOW_PHASE)
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    completed = subprocess.run(
+        [sys.executable, "-c", _CHILD_SCRIPT, json.dumps(phases)],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    report = json.loads(completed.stdout.strip().splitlines()[-1])
+    home_phases = [entry for entry in report["phases"] if entry["phase"] != TENSORFLOW_PHASE[0]]
+    report["home_page_seconds"] = sum(entry["seconds"] for entry in home_phases)
+    report["tensorflow_before_home_page"] = any(entry["tensorflow_loaded"] for entry in home_phases)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report wall-clock time of each startup import phase.")
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--max-seconds", type=float, help="exit with status 1 if the home page imports take longer")
+    parser.add_argument("--include-tensorflow", action="store_true", help="time the TensorFlow import as a last phase")
+    args = parser.parse_args(argv)
+
+    report = measure_startup(include_tensorflow=args.include_tensorflow)
+    for entry in report["phases"]:
+        status = f"  ({entry['error']})" if "error" in entry else ""
+        print(f"{entry['phase']:<12} {entry['seconds'] * 1000:9.1f} ms{status}")
+    print(f"{'home page':<12} {report['home_page_seconds'] * 1000:9.1f} ms")
+    print(f"TensorFlow imported before the home page: {report['tensorflow_before_home_page']}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=4)
+
+    failed = report["tensorflow_before_home_page"] or any("error" in entry for entry in report["phases"])
+    if args.max_seconds is not None and report["home_page_seconds"] > args.max_seconds:
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import numpy as np
+
+
+NUM_CHANNELS = 12
+
+# visible_board values run from -3 (flagged) to 8; shift them so they index table rows.
+VALUE_OFFSET = 3
+
+STATE_LOOKUP = np.zeros((12, NUM_CHANNELS), dtype=np.float32)
+STATE_LOOKUP[-2 + VALUE_OFFSET, 0] = 1
+STATE_LOOKUP[-3 + VALUE_OFFSET, 1] = 1
+for value in range(9):
+    STATE_LOOKUP[value + VALUE_OFFSET, value + 2] = 1
+# -1 (an exploded bomb) has no channel and encodes to all zeros.
+
+CHANNEL_VALUES = np.array([-2, -3, 0, 1, 2, 3, 4, 5, 6, 7, 8, -1], dtype=np.int8)
+
+
+def encode_state(visible_board, out=None):
+    board = np.asarray(visible_board)
+    if out is None:
+        out = np.empty(board.shape + (NUM_CHANNELS,), dtype=np.float32)
+    np.take(STATE_LOOKUP, board + VALUE_OFFSET, axis=0, out=out)
+    return out
+
+
+def decode_state(board_tensor):
+    # Inverse of encode_state; works on one tensor or a stack of them.
+    tensor = np.asarray(board_tensor)
+    channels = np.argmax(tensor, axis=-1)
+    channels[~tensor.any(axis=-1)] = NUM_CHANNELS - 1
+    return CHANNEL_VALUES[channels]
+
+
+def encode_action_mask(visible_board):
+    # Flat layout matches (rows, cols, 2): reveal needs a hidden cell, flag toggles hidden or flagged.
+    board = np.asarray(visible_board)
+    mask = np.empty(board.shape + (2,), dtype=bool)
+    np.equal(board, -2, out=mask[..., 0])
+    np.logical_or(mask[..., 0], board == -3, out=mask[..., 1])
+    return mask.reshape(board.shape[:-2] + (-1,))
+
+
+class StateEncoder:
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.tensor = np.zeros((rows, cols, NUM_CHANNELS), dtype=np.float32)
+        self.previous_board = np.empty((rows, cols), dtype=np.int8)
+        self.initialized = False
+
+    def reset(self):
+        self.initialized = False
+
+    def encode(self, visible_board, changed_cells=None):
+        board = np.asarray(visible_board)
+
+        if not self.initialized:
+            encode_state(board, out=self.tensor)
+            self.previous_board[...] = board
+            self.initialized = True
+            return self.tensor
+
+        if changed_cells is None:
+            changed_cells = np.nonzero(board != self.previous_board)
+        rows, cols = changed_cells
+
+        if len(rows):
+            values = board[rows, cols]
+            self.tensor[rows, cols] = STATE_LOOKUP[values + VALUE_OFFSET]
+            self.previous_board[rows, cols] = values
+
+        return self.tensor
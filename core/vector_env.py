@@ -0,0 +1,145 @@
+import numpy as np
+from core.board_generator import sample_mines_batch, solution_from_mines
+from core.compact_board import BOARD_DTYPE
+from core.minesweeper_env import GameOverError
+from core.state_encoder import encode_action_mask, encode_state
+
+
+class VectorMinesweeperEnv:
+    def __init__(self, num_envs=1, rows=9, cols=9, bombs=10, auto_reset=True, seed=None, board_bank=None):
+        self.num_envs = num_envs
+        self.rows = rows
+        self.cols = cols
+        self.bombs = bombs
+        self.auto_reset = auto_reset
+        self.action_space_size = rows * cols * 2
+        self.rng = np.random.default_rng(seed)
+        if board_bank is not None:
+            board_bank.check_layout(rows, cols, bombs)
+        self.board_bank = board_bank
+        self.bank_cursor = 0
+
+    def reset(self, n=None, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        if n is not None:
+            self.num_envs = n
+
+        shape = (self.num_envs, self.rows, self.cols)
+        self.solution_board = np.zeros(shape, dtype=BOARD_DTYPE)
+        self.visible_board = np.full(shape, -2, dtype=BOARD_DTYPE)
+        self.game_over = np.zeros(self.num_envs, dtype=bool)
+        self.win = np.zeros(self.num_envs, dtype=bool)
+        self.revealed_safe = np.zeros(self.num_envs, dtype=np.int64)
+        self.safe_cells = self.rows * self.cols - self.bombs
+
+        self._reset_boards(np.arange(self.num_envs))
+
+        return self._get_state_tensor(), self._get_action_mask()
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"Expected {self.num_envs} actions, got shape {actions.shape}.")
+        if not self.auto_reset and np.any(self.game_over):
+            raise GameOverError("Cannot take action on a finished game. Please reset the environment.")
+
+        rows, cols, action_type = np.unravel_index(actions, (self.rows, self.cols, 2))
+        envs = np.arange(self.num_envs)
+        current = self.visible_board[envs, rows, cols]
+
+        already_revealed = (action_type == 0) & (current >= 0)
+
+        reveal = (action_type == 0) & (current == -2)
+        if np.any(reveal):
+            self._reveal_tiles(envs[reveal], rows[reveal], cols[reveal])
+
+        flag = action_type == 1
+        if np.any(flag):
+            flag_envs, flag_rows, flag_cols = envs[flag], rows[flag], cols[flag]
+            values = self.visible_board[flag_envs, flag_rows, flag_cols]
+            toggled = np.where(values == -2, -3, np.where(values == -3, -2, values))
+            self.visible_board[flag_envs, flag_rows, flag_cols] = toggled
+
+        rewards = self._get_reward()
+        self.win = self._check_win() & ~self.game_over
+        self.game_over |= self.win
+        rewards[self.win] = 200
+        rewards[self.game_over & ~self.win] = -100
+        rewards[already_revealed] = -5
+
+        dones = self.game_over.copy()
+        if self.auto_reset and np.any(dones):
+            self._reset_boards(np.flatnonzero(dones))
+
+        return self._get_state_tensor(), rewards, dones, self._get_action_mask()
+
+    def _reset_boards(self, env_ids):
+        count = len(env_ids)
+        if self.board_bank is not None:
+            mines, start_flat = self.board_bank.get_batch(np.arange(self.bank_cursor, self.bank_cursor + count))
+            self.bank_cursor += count
+            self.solution_board[env_ids] = solution_from_mines(mines)
+        else:
+            start_flat = self.rng.integers(0, self.rows * self.cols, size=count)
+            self.solution_board[env_ids] = self._generate_boards(start_flat)
+        start_rows, start_cols = np.divmod(start_flat, self.cols)
+
+        self.visible_board[env_ids] = -2
+        self.game_over[env_ids] = False
+        self.win[env_ids] = False
+        self.revealed_safe[env_ids] = 0
+
+        self._reveal_tiles(env_ids, start_rows, start_cols)
+
+    def _generate_boards(self, start_flat):
+        mines = sample_mines_batch(len(start_flat), self.rows, self.cols, self.bombs, start_flat, self.rng)
+        return solution_from_mines(mines)
+
+    def _reveal_tiles(self, env_ids, rows, cols):
+        hit_bomb = self.solution_board[env_ids, rows, cols] == -1
+        if np.any(hit_bomb):
+            self.visible_board[env_ids[hit_bomb], rows[hit_bomb], cols[hit_bomb]] = -1
+            self.game_over[env_ids[hit_bomb]] = True
+
+        safe = ~hit_bomb
+        env_ids, rows, cols = env_ids[safe], rows[safe], cols[safe]
+        if len(env_ids) == 0:
+            return
+
+        solution = self.solution_board[env_ids]
+        hidden = self.visible_board[env_ids] == -2
+        region = np.zeros(solution.shape, dtype=bool)
+        region[np.arange(len(env_ids)), rows, cols] = True
+
+        # Grow every region through zero cells in lockstep until no board changes.
+        frontier = region & (solution == 0)
+        while np.any(frontier):
+            grown = self._dilate(frontier) & hidden & ~region
+            region |= grown
+            frontier = grown & (solution == 0)
+
+        visible = self.visible_board[env_ids]
+        visible[region] = solution[region]
+        self.visible_board[env_ids] = visible
+        np.add.at(self.revealed_safe, env_ids, region.sum(axis=(1, 2)))
+
+    def _dilate(self, mask):
+        padded = np.pad(mask, ((0, 0), (1, 1), (1, 1)))
+        grown = np.zeros(mask.shape, dtype=bool)
+        for dr in range(3):
+            for dc in range(3):
+                grown |= padded[:, dr:dr + self.rows, dc:dc + self.cols]
+        return grown
+
+    def _get_reward(self):
+        return self.revealed_safe.copy()
+
+    def _check_win(self):
+        return self.revealed_safe == self.safe_cells
+
+    def _get_action_mask(self):
+        return encode_action_mask(self.visible_board)
+
+    def _get_state_tensor(self):
+        return encode_state(self.visible_board)
@@ -0,0 +1,116 @@
+import argparse
+import sys
+import time
+import numpy as np
+
+
+NEIGHBOR_OFFSETS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)]
+
+
+def _shifted_slices(shape, dr, dc):
+    rows, cols = shape
+    src_r = slice(max(0, -dr), rows - max(0, dr))
+    src_c = slice(max(0, -dc), cols - max(0, dc))
+    dst_r = slice(max(0, dr), rows - max(0, -dr))
+    dst_c = slice(max(0, dc), cols - max(0, -dc))
+    return (src_r, src_c), (dst_r, dst_c)
+
+
+def label_zero_regions(solution_board):
+    zero = solution_board == 0
+    rows, cols = zero.shape
+    flat_index = np.arange(rows * cols).reshape(rows, cols)
+
+    # Every pair of touching zero cells, each pair listed once (the other four
+    # directions are the same pairs reversed).
+    first, second = [], []
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        src, dst = _shifted_slices(zero.shape, dr, dc)
+        both = zero[src] & zero[dst]
+        first.append(flat_index[src][both])
+        second.append(flat_index[dst][both])
+    first = np.concatenate(first)
+    second = np.concatenate(second)
+
+    # Vectorised union-find: hook the larger root of every edge onto the smaller one,
+    # then compress paths by pointer jumping, until no edge spans two trees. Each cell
+    # ends up pointing at the smallest flat index in its region.
+    parent = np.arange(rows * cols)
+    while len(first):
+        root_a = parent[first]
+        root_b = parent[second]
+        split = root_a != root_b
+        if not np.any(split):
+            break
+        first, second = first[split], second[split]
+        root_a, root_b = root_a[split], root_b[split]
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+    # Renumber to 1..n so labels index straight into the region table.
+    roots = parent[flat_index[zero]]
+    unique_roots, compact = np.unique(roots, return_inverse=True)
+    labels = np.zeros((rows, cols), dtype=np.int64)
+    labels[zero] = compact.ravel() + 1
+    return labels
+
+
+def build_reveal_regions(labels):
+    rows, cols = labels.shape
+    num_regions = int(labels.max())
+    if num_regions == 0:
+        return []
+
+    flat_index = np.arange(rows * cols).reshape(rows, cols)
+    zero = labels > 0
+    region_keys = [labels[zero].astype(np.int64) * (rows * cols) + flat_index[zero]]
+
+    # Zero cells belong to exactly one region; only the numbered border can be shared.
+    border_keys = []
+    for dr, dc in NEIGHBOR_OFFSETS:
+        if dr == 0 and dc == 0:
+            continue
+        src, dst = _shifted_slices(labels.shape, dr, dc)
+        source_labels = labels[src]
+        inside = (source_labels > 0) & ~zero[dst]
+        border_keys.append(source_labels[inside].astype(np.int64) * (rows * cols) + flat_index[dst][inside])
+    region_keys.append(np.unique(np.concatenate(border_keys)))
+
+    # Keys encode (label, cell), so sorting them makes every region one contiguous run.
+    keys = np.sort(np.concatenate(region_keys))
+    key_labels, cells = np.divmod(keys, rows * cols)
+    bounds = np.searchsorted(key_labels, np.arange(1, num_regions + 2))
+    return [cells[bounds[i]:bounds[i + 1]] for i in range(num_regions)]
+
+
+def main(argv=None):
+    # Timing check for large boards: labels and reveal regions are rebuilt on every reset.
+    from core.board_generator import generate_board
+
+    parser = argparse.ArgumentParser(description="Time zero-region labelling on a large board.")
+    parser.add_argument("--size", type=int, default=1000, help="rows and columns of the board")
+    parser.add_argument("--mines", type=int, nargs="+", default=[10000, 100000, 123000, 200000])
+    parser.add_argument("--max-seconds", type=float, default=1.0, help="exit with status 1 if any board takes longer")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    failed = False
+    for mines in args.mines:
+        solution = generate_board(args.size, args.size, mines, args.size // 2, args.size // 2, rng)
+        started = time.perf_counter()
+        labels = label_zero_regions(solution)
+        labelled = time.perf_counter() - started
+        build_reveal_regions(labels)
+        total = time.perf_counter() - started
+        failed |= total > args.max_seconds
+        print(f"{mines:>8} mines  label {labelled * 1000:8.1f} ms  regions {(total - labelled) * 1000:8.1f} ms  ({int(labels.max())} regions)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
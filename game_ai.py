@@ -2,6 +2,8 @@
 from PyQt6.QtCore import QTimer, Qt
 from PyQt6.QtGui import QAction, QKeySequence
 from ai.ai_agent import AIAgent
+from ai.solver_session import SolverSession
+from core.state_encoder import encode_state
 from game_ui import MinesweeperUI
 import random
 
@@ -10,7 +12,8 @@ class AIGameWindow(MinesweeperUI):
     def __init__(self, main_window=None, sound_manager=None):
         super().__init__(mode="ai", main_window=main_window, sound_manager=sound_manager)
         self.setWindowTitle("Minesweeper - AI Mode")
-        self.ai_agent = AIAgent()
+        self.ai_agent = AIAgent(total_mines=self.num_bombs)
+        self.solver_session = SolverSession(self.grid_size, self.grid_size)
         self.last_move = None
 
         self._setup_shortcuts()
@@ -41,16 +44,31 @@ def start_ai_loop(self):
 
         board_state = self.get_visible_board_state()
         board_tensor = self.convert_to_tensor(board_state)
-        print("DEBUG: Calling ai_agent.predict_move...")
 
-        row, col, action_type = self.ai_agent.predict_move(board_tensor)
-        print(f"DEBUG: ai_agent.predict_move returned: row={row}, col={col}, action={action_type}")
+        # Moves already deduced from earlier positions are drained before asking the agent.
+        self.solver_session.update(board_state)
+        queued_move = self.solver_session.pop_move()
+        if queued_move is not None:
+            row, col, action_type = queued_move
+            print(f"DEBUG (Session): Using queued move at ({row}, {col}), action={action_type}")
+        else:
+            print("DEBUG: Calling ai_agent.predict_move...")
+            move = self.ai_agent.predict_move(board_tensor)
+            if move is None:
+                self.check_win()
+                return
+            row, col, action_type = move
+            print(f"DEBUG: ai_agent.predict_move returned: row={row}, col={col}, action={action_type}")
 
         current_move = (row, col, action_type)
         if current_move == self.last_move:
-            print("DEBUG: AI is repeating a move, forcing a random action.")
+            endgame_move = self.ai_agent.endgame_solver.find_move(board_state, self.num_bombs, exclude={(row, col)})
             hidden_tiles = np.argwhere((board_tensor[:, :, 0] == 1) & (board_tensor[:, :, 1] == 0))
-            if len(hidden_tiles) > 0:
+            if endgame_move is not None:
+                print("DEBUG: AI is repeating a move, using the endgame solver instead.")
+                row, col, action_type = endgame_move
+            elif len(hidden_tiles) > 0:
+                print("DEBUG: AI is repeating a move, forcing a random action.")
                 random_tile = random.choice(hidden_tiles)
                 row, col, action_type = random_tile[0], random_tile[1], 0
             else:
@@ -69,23 +87,12 @@ def start_ai_loop(self):
             QTimer.singleShot(100, self.start_ai_loop)
 
     def convert_to_tensor(self, visible_board):
-        tensor = np.zeros((9, 9, 12), dtype=np.float32)
-        for i in range(9):
-            for j in range(9):
-                val = visible_board[i][j]
-                if val == -2:
-                    tensor[i][j][0] = 1
-                elif val == -3:
-                    tensor[i][j][1] = 1
-                elif val == 0:
-                    tensor[i][j][2] = 1
-                elif val > 0 and val <= 8:
-                    tensor[i][j][int(val) + 2] = 1
-        return tensor
+        return encode_state(visible_board)
 
     def reset_game(self):
         super().reset_game()
 
         self.last_move = None
+        self.solver_session.reset()
 
         QTimer.singleShot(500, self.start_ai_loop)
\ No newline at end of file
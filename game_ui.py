@@ -2,8 +2,8 @@
 import json
 import os
 import time
-import random
 import datetime
+import numpy as np
 from PyQt6.QtWidgets import (
     QWidget, QPushButton,
     QGridLayout, QVBoxLayout, QHBoxLayout,
@@ -12,6 +12,7 @@
 from PyQt6.QtCore import QTimer, Qt, QPropertyAnimation, QEasingCurve
 from PyQt6.QtGui import QMovie, QAction, QColor, QShortcut, QKeySequence
 from core import soundManager
+from core.board_generator import generate_board
 from core.ScoreManager import ScoreManager
 from core.hint_manager import HintManager
 from core.soundManager import SoundManager
@@ -98,9 +99,10 @@ def flag(self):
 
 
 class MinesweeperUI(QWidget):
-    def __init__(self, mode="manual", main_window=None, sound_manager=None):
+    def __init__(self, mode="manual", main_window=None, sound_manager=None, seed=None):
         super().__init__()
         self.main_window = main_window
+        self.rng = np.random.default_rng(seed)
         if sound_manager:
             self.sounds = sound_manager
         else:
@@ -788,30 +790,20 @@ def update_timer(self):
             self.current_score_label.setText(f"Score: {current_score}")
 
     def place_bombs(self, safe_row, safe_col):
-        positions = [(r, c) for r in range(self.grid_size) for c in range(self.grid_size)]
-        positions.remove((safe_row, safe_col))
-        bomb_positions = random.sample(positions, self.num_bombs)
+        solution = generate_board(self.grid_size, self.grid_size, self.num_bombs, safe_row, safe_col, self.rng)
 
-        for r, c in bomb_positions:
+        for r, c in zip(*np.nonzero(solution == -1)):
             self.buttons[r][c].is_bomb = True
 
         for r in range(self.grid_size):
             for c in range(self.grid_size):
                 if not self.buttons[r][c].is_bomb:
-                    self.buttons[r][c].adjacent_bombs = self.count_adjacent_bombs(r, c)
+                    self.buttons[r][c].adjacent_bombs = int(solution[r, c])
 
         # Only for developers not for public use
         # if self.devtools.active:
         #     self.devtools.update_visuals(self)
 
-    def count_adjacent_bombs(self, row, col):
-        return sum(
-            self.buttons[r][c].is_bomb
-            for r in range(max(0, row - 1), min(self.grid_size, row + 2))
-            for c in range(max(0, col - 1), min(self.grid_size, col + 2))
-            if (r, c) != (row, col)
-        )
-
     def reset_game(self):
         self.load_settings()
         self.start_time = None
@@ -7,7 +7,8 @@
     QRadioButton, QGroupBox, QSlider, QScrollArea
 )
 from PyQt6.QtGui import QFont, QColor, QAction, QKeySequence
-from PyQt6.QtCore import Qt, QEvent
+from PyQt6.QtCore import Qt, QEvent, QTimer
+from ai import model_registry
 from core.settingsManager import SettingsManager
 from core.soundManager import SoundManager
 from game_manual import ManualGameWindow
@@ -46,6 +47,10 @@ def __init__(self):
         self._create_howto_card(container)
         self._create_menu()
 
+        # Load the AI model while the menu is idle so AI mode opens without waiting. This
+        # only preloads the NumPy export; the TensorFlow fallback waits for AI mode.
+        QTimer.singleShot(1000, model_registry.preload)
+
     def _create_background_grid(self, container):
         grid_widget = QWidget(container)
         self.grid_widget = grid_widget